@@ -4,7 +4,7 @@
 sudo apt update && sudo apt upgrade -y
 
 # Install X server, Openbox, and Chromium (instead of Falkon)
-sudo apt install --no-install-recommends xserver-xorg x11-xserver-utils xinit openbox chromium-browser git unclutter -y
+sudo apt install --no-install-recommends xserver-xorg x11-xserver-utils xinit openbox chromium-browser git unclutter python3-gpiozero python3-websockets -y
 
 # Clone the web application repository
 git clone https://github.com/aloago/Fasnacht.git ~/Fasnacht
@@ -12,7 +12,14 @@ git clone https://github.com/aloago/Fasnacht.git ~/Fasnacht
 # Create Openbox config directory if it doesn't exist
 mkdir -p ~/.config/openbox
 
-# Create the autostart file for Chromium in kiosk mode
+# Create the autostart file: the GPIO WebSocket, which also serves the page over HTTP,
+# then Chromium in kiosk mode once the server is listening. If it is not up within
+# about 10 seconds, Chromium opens the page from file:// instead
+echo 'python3 '"$HOME"'/Fasnacht/Web_2.0/grid_websocket.py --static &' > ~/.config/openbox/autostart
+echo 'KIOSK_URL=file://'"$HOME"'/Fasnacht/Web_2.0/index.html' >> ~/.config/openbox/autostart
+cat >> ~/.config/openbox/autostart <<'EOF'
+timeout 10 sh -c "until python3 -c 'import socket; socket.create_connection((\"localhost\", 8000))' 2>/dev/null; do sleep 0.2; done" && KIOSK_URL=http://localhost:8000/
+EOF
 echo 'chromium-browser \
 --kiosk \
 --incognito \
@@ -22,7 +29,7 @@ echo 'chromium-browser \
 --disable-features=TranslateUI \
 --disable-pinch \
 --block-new-web-contents \
-file://'"$HOME"'/Fasnacht/Web_2.0/index.html' > ~/.config/openbox/autostart
+"$KIOSK_URL"' >> ~/.config/openbox/autostart
 
 # Add screen saver/power management disable commands
 echo 'xset s off' >> ~/.config/openbox/autostart
@@ -1,28 +1,94 @@
+import argparse
 import asyncio
+import os
 import websockets
-from gpiozero import Button
+from gpiozero import Button, GPIOZeroError
 
-# GPIO setup
-button = Button(2, pull_up=True)  # GPIO 2 with internal pull-up
+from static_site import StaticSite
 
-async def gpio_state_server(websocket, path=None):
+HEARTBEAT_SECONDS = 10  # Resend the state this often between edges, so a missed message heals itself
+
+
+class GpioBroadcaster:
     """
-    WebSocket handler that sends the state of a GPIO-connected button.
-    Accepts an optional `path` parameter for compatibility.
+    Pushes the state of a GPIO-connected button to every connected kiosk.
+    A single watcher on the button's edges replaces per-client polling; between
+    edges only a slow heartbeat is sent.
     """
-    print("WebSocket client connected. Starting GPIO state updates...")
-    try:
+
+    def __init__(self, button, loop, heartbeat_seconds=HEARTBEAT_SECONDS):
+        self.button = button
+        self.loop = loop
+        self.heartbeat_seconds = heartbeat_seconds
+        self.clients = set()
+        # gpiozero calls these from its own thread; hand each edge to the event loop in order
+        button.when_pressed = lambda: loop.call_soon_threadsafe(self.broadcast, True)
+        button.when_released = lambda: loop.call_soon_threadsafe(self.broadcast, False)
+
+    def broadcast(self, state):
+        """Send the state (True = high when pressed, False = low when not pressed) to every client."""
+        # One send per client rather than websockets.broadcast, which needs websockets 10;
+        # Debian Bullseye ships 8.1
+        message = str(state)
+        for websocket in list(self.clients):
+            asyncio.ensure_future(self.send(websocket, message))
+
+    async def send(self, websocket, message):
+        """Send to one client, dropping it if its connection has closed."""
+        try:
+            await websocket.send(message)
+        except websockets.exceptions.ConnectionClosed:
+            self.clients.discard(websocket)
+
+    async def handler(self, websocket, path=None):
+        """
+        WebSocket handler that registers a client and sends it the current state right away.
+        Accepts an optional `path` parameter for compatibility.
+        """
+        print("WebSocket client connected. Sending GPIO state updates...")
+        self.clients.add(websocket)
+        try:
+            await websocket.send(str(self.button.is_pressed))
+            await websocket.wait_closed()
+        except websockets.exceptions.ConnectionClosed:
+            pass
+        finally:
+            self.clients.discard(websocket)
+            print("WebSocket client disconnected.")
+
+    async def heartbeat(self):
         while True:
-            # Read GPIO state (True = high when pressed, False = low when not pressed)
-            state = button.is_pressed
-            await websocket.send(str(state))
-            await asyncio.sleep(0.1)  # Throttle updates to reduce processing load
-    except websockets.exceptions.ConnectionClosed:
-        print("WebSocket client disconnected.")
-
-# Start WebSocket server on all interfaces at port 8765
-start_server = websockets.serve(gpio_state_server, "0.0.0.0", 8765)
-
-# Run the server event loop
-asyncio.get_event_loop().run_until_complete(start_server)
-asyncio.get_event_loop().run_forever()
\ No newline at end of file
+            await asyncio.sleep(self.heartbeat_seconds)
+            self.broadcast(self.button.is_pressed)
+
+
+async def main(static=False, http_port=8000):
+    if static:
+        # Serve Web_2.0 itself from the same event loop, first, so the page comes up even if GPIO fails
+        site = StaticSite(os.path.dirname(os.path.abspath(__file__)))
+        try:
+            await asyncio.start_server(site.handle, "0.0.0.0", http_port)  # Listens until the loop stops
+            print(f"Serving {len(site.assets)} files on http://localhost:{http_port}/")
+        except OSError as e:
+            print(f"Warning: Could not serve Web_2.0 on port {http_port}: {e}")
+
+    # GPIO setup
+    try:
+        button = Button(2, pull_up=True, bounce_time=0.05)  # GPIO 2 with internal pull-up, 50 ms debounce
+    except (GPIOZeroError, OSError) as e:
+        print(f"Warning: Could not set up the GPIO button, no switch updates will be sent: {e}")
+        await asyncio.Future()  # Keep serving the page
+        return
+
+    broadcaster = GpioBroadcaster(button, asyncio.get_running_loop())
+    # Start WebSocket server on all interfaces at port 8765
+    async with websockets.serve(broadcaster.handler, "0.0.0.0", 8765):
+        await broadcaster.heartbeat()  # Run forever
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="GPIO state WebSocket for the Web_2.0 kiosk")
+    parser.add_argument("--static", action="store_true", help="also serve Web_2.0 over HTTP")
+    parser.add_argument("--http-port", type=int, default=8000)
+    args = parser.parse_args()
+    asyncio.run(main(args.static, args.http_port))
@@ -1,26 +1,4 @@
 const config = {
-    files: {
-        "fritschi.webp": { label: "zünftig", priority: 1 },
-        "hexe.webp": { label: "rüüdig", priority: 2 },
-        "spoerri.webp": { label: "kult-urig", priority: 3 },
-        "basler.webp": { label: "appropriated", priority: 4 },
-        "fisch.webp": { label: "laborig", priority: 13 },
-        "affe.webp": { label: "huereaffig", priority: 6 },
-        "sau.webp": { label: "sauglatt", priority: 7 },
-        "krieger.webp": { label: "kriegerisch", priority: 8 },
-        "clown.webp": { label: "creepy", priority: 9 },
-        "hase.webp": { label: "cute", priority: 10 },
-        "einhorn.png": { label: "magisch", priority: 11 },
-        "grinch.webp": { label: "cringe", priority: 17 },
-        "alien.webp": { label: "extraterrestrisch", priority: 5 },
-        "teufel.webp": { label: "teuflisch", priority: 14 },
-        "guy.webp": { label: "random", priority: 15 },
-        "ueli.webp": { label: "schwurblig", priority: 16 },
-        "steampunk.webp": { label: "boomerig", priority: 12 },
-        "pippi.webp": { label: "feministisch", priority: 18 },
-        "wonderwoman.webp": { label: "superstark", priority: 19 },
-        "federer.webp": { label: "bönzlig", priority: 20 }
-    },
     loading_time: 1000,
     back_button_delay: 0,
     selection_delay: 250,
@@ -39,6 +17,12 @@ const gpioFiles = [
     "alien-hase.webp"
 ];
 
+// Versioned URL when served by grid_websocket.py --static, so the browser can cache it for good
+function assetUrl(path) {
+    const version = window.ASSET_VERSIONS && window.ASSET_VERSIONS[path];
+    return version ? `${path}?v=${version}` : path;
+}
+
 // Cache frequently used elements
 const gridContainer = document.querySelector('.grid-container');
 const squareBlock = document.querySelector('.square-block');
@@ -50,10 +34,55 @@ const combinedImage = document.getElementById('combinedImage');
 let selectedItems = new Set();
 let selectionDisabled = false;
 
+// Decoded images held ready for the selection screen, keyed by URL. The lock screen
+// and easter egg images stay for good; the combinations follow the first selected tile.
+const pinnedImages = new Map();
+let combinationImages = new Map();
+let combinationsFor = null;
+
+// Start loading and decoding path off the main thread; resolves once it can be shown
+function preloadImage(pool, path) {
+    const url = assetUrl(path);
+    if (!pool.has(url)) {
+        const img = new Image();
+        img.src = url;
+        // A failed decode (e.g. a missing file) just leaves the plain load to the <img>
+        pool.set(url, { img, ready: img.decode().catch(() => {}) });
+    }
+    return pool.get(url).ready;
+}
+
+// Show path in the selection image, once decoded if it was preloaded
+function showDecoded(path) {
+    const url = assetUrl(path);
+    const entry = pinnedImages.get(url) || combinationImages.get(url);
+    return (entry ? entry.ready : Promise.resolve()).then(() => {
+        combinedImage.src = url; // Same URL as the pooled Image, so the decoded bitmap is reused
+    });
+}
+
+// Pair -> combination image, precomputed by build_web_index.py
+function combinationPath(filenames) {
+    return `Images/Selections/${window.COMBINATIONS[[...filenames].sort().join('|')]}`;
+}
+
+// Decode the 19 combinations the first selected tile can still lead to
+function preloadCombinations(filename) {
+    if (combinationsFor === filename) return;
+    combinationsFor = filename;
+    combinationImages = new Map(); // Drop the previous tile's images
+    gridContainer.querySelectorAll('.grid-item').forEach(item => {
+        const other = item.dataset.filename;
+        if (other !== filename) {
+            preloadImage(combinationImages, combinationPath([filename, other]));
+        }
+    });
+}
+
 // Function to show a random file from the list
 function showGpioLockScreen() {
     const randomFile = gpioFiles[Math.floor(Math.random() * gpioFiles.length)];
-    combinedImage.src = `Images/Selections/${randomFile}`;
+    showDecoded(`Images/Selections/${randomFile}`);
     selectionScreen.style.display = 'block';
     backButton.style.display = 'none'; // Hide the back button
 }
@@ -115,6 +144,9 @@ gridContainer.addEventListener('click', (event) => {
     } else if (selectedItems.size < 2) {
         selectedItems.add(filename);
         item.classList.add('selected');
+        if (selectedItems.size === 1) {
+            preloadCombinations(filename);
+        }
     }
 
     if (selectedItems.size === 2) {
@@ -131,20 +163,17 @@ function showLoadingScreen() {
     loadingScreen.style.display = 'block';
 
     setTimeout(() => {
-        loadingScreen.style.display = 'none';
         showSelectionScreen();
     }, config.loading_time);
 }
 
 function showSelectionScreen() {
-    const sortedItems = Array.from(selectedItems)
-        .map(filename => ({ filename, ...config.files[filename] }))
-        .sort((a, b) => a.priority - b.priority);
-
-    const combinedName = `${sortedItems[0].filename.split('.')[0]}-${sortedItems[1].filename.split('.')[0]}.webp`;
-    combinedImage.src = `Images/Selections/${combinedName}`;
-    combinedImage.draggable = false;
-    selectionScreen.style.display = 'block';
+    // The spinner stays up until the image is decoded, which is usually already the case
+    showDecoded(combinationPath(Array.from(selectedItems))).then(() => {
+        loadingScreen.style.display = 'none';
+        combinedImage.draggable = false;
+        selectionScreen.style.display = 'block';
+    });
 }
 
 backButton.addEventListener('click', () => {
@@ -153,29 +182,12 @@ backButton.addEventListener('click', () => {
     }, config.back_button_delay);
 });
 
-// Build the grid
-const fragment = document.createDocumentFragment();
-Object.entries(config.files).forEach(([filename, data]) => {
-    const gridItem = document.createElement('div');
-    gridItem.classList.add('grid-item');
-    gridItem.dataset.filename = filename;
-    gridItem.dataset.priority = data.priority;
-
-    const img = document.createElement('img');
-    img.src = `Images/Grid/${filename}`;
-    img.alt = data.label;
-    img.draggable = false;
-    make_pressable(img);
-
-    const labelDiv = document.createElement('div');
-    labelDiv.classList.add('image-label');
-    labelDiv.textContent = data.label;
-
-    gridItem.appendChild(img);
-    gridItem.appendChild(labelDiv);
-    fragment.appendChild(gridItem);
-});
-document.querySelector('.grid-container').appendChild(fragment);
+// The tiles are prerendered in index.html by build_web_index.py
+gridContainer.querySelectorAll('.grid-item img').forEach(make_pressable);
+
+// Warm the lock screen images and the easter egg at page load
+gpioFiles.forEach(file => preloadImage(pinnedImages, `Images/Selections/${file}`));
+preloadImage(pinnedImages, 'Images/Other/easteregg.png');
 
 // Existing make_pressable function
 function make_pressable(element) {
@@ -226,7 +238,7 @@ function showEasterEgg() {
     squareBlock.style.display = 'none';
     selectionScreen.style.display = 'block';
     backButton.style.display = 'none';
-    combinedImage.src = 'Images/Other/easteregg.png';
+    showDecoded('Images/Other/easteregg.png');
     
     setTimeout(() => {
         returnToGrid();
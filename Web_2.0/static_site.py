@@ -0,0 +1,144 @@
+import asyncio
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import re
+from collections import namedtuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+mimetypes.add_type("image/webp", ".webp")  # Missing from older Pythons' tables
+
+# Text is gzipped once at startup; WebP, PNG and GIF are already compressed
+COMPRESSIBLE_TYPES = ("text/html", "text/css", "text/javascript", "application/javascript", "application/json", "image/svg+xml")
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"  # Cache, but check the ETag before every use
+ASSET_ATTRIBUTE = re.compile(r'(src|href)="([^"?#:]+)"')
+
+StaticAsset = namedtuple("StaticAsset", ["path", "content_type", "version", "body", "gzip_body"])
+
+
+class StaticSite:
+    """
+    Serves a directory over HTTP/1.1 from the asyncio event loop it is started on.
+    Every file is hashed at startup: responses carry a strong ETag, URLs with a
+    matching `?v=<version>` are cached as immutable, and text is sent gzipped
+    when the browser accepts it. Only files present at startup are served.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self.assets = {}
+        pages = []
+        for directory, _, names in os.walk(root):
+            for name in sorted(names):
+                path = os.path.join(directory, name)
+                url_path = os.path.relpath(path, root).replace(os.sep, "/")
+                if name.startswith(".") or name.endswith((".py", ".pyc")):
+                    continue
+                if name.endswith(".html"):
+                    pages.append((url_path, path))  # Versioned after everything they link to
+                    continue
+                with open(path, "rb") as f:
+                    data = f.read()
+                self.assets[url_path] = self._asset(path, data)
+
+        versions = {url_path: asset.version for url_path, asset in self.assets.items()}
+        for url_path, path in pages:
+            with open(path, encoding="utf-8") as f:
+                html = self._versioned_page(f.read(), versions)
+            self.assets[url_path] = self._asset(path, html.encode("utf-8"))
+
+    def _asset(self, path, data):
+        """Hash data and keep compressible bodies in memory; images are sent from disk."""
+        content_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+        compressible = content_type in COMPRESSIBLE_TYPES
+        if content_type.startswith("text/"):
+            content_type += "; charset=utf-8"
+        version = hashlib.sha1(data).hexdigest()[:16]
+        if not compressible:
+            return StaticAsset(path, content_type, version, None, None)
+        return StaticAsset(path, content_type, version, data, gzip.compress(data, 9, mtime=0))
+
+    @staticmethod
+    def _versioned_page(html, versions):
+        """Point the page's own links at versioned URLs and hand the version table to script.js."""
+        html = ASSET_ATTRIBUTE.sub(
+            lambda m: f'{m[1]}="{m[2]}?v={versions[m[2]]}"' if m[2] in versions else m[0], html)
+        manifest = f"<script>window.ASSET_VERSIONS = {json.dumps(versions, separators=(',', ':'))};</script>\n"
+        position = html.find("<script")
+        return html[:position] + manifest + html[position:] if position >= 0 else html
+
+    async def handle(self, reader, writer):
+        """Answer GET and HEAD requests on one keep-alive connection."""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                method, target, version = request_line.decode("latin-1").split()
+                keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                if method not in ("GET", "HEAD"):
+                    await self._send(writer, 405, {"Allow": "GET, HEAD"}, b"", False)
+                    break
+                await self._respond(writer, method, target, headers, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, ValueError):
+            pass  # Client went away or sent something that is not HTTP
+        finally:
+            writer.close()
+
+    async def _respond(self, writer, method, target, headers, keep_alive):
+        url = urlsplit(target)
+        url_path = unquote(url.path).lstrip("/") or "index.html"
+        asset = self.assets.get(url_path)
+        if asset is None:
+            await self._send(writer, 404, {"Content-Type": "text/plain; charset=utf-8"}, b"Not found", keep_alive)
+            return
+
+        gzipped = asset.gzip_body is not None and "gzip" in headers.get("accept-encoding", "")
+        etag = f'"{asset.version}-gz"' if gzipped else f'"{asset.version}"'  # Strong: one per representation
+        versioned = parse_qs(url.query).get("v") == [asset.version]
+        response_headers = {"ETag": etag, "Cache-Control": IMMUTABLE if versioned else REVALIDATE}
+        if asset.gzip_body is not None:
+            response_headers["Vary"] = "Accept-Encoding"
+
+        if etag in headers.get("if-none-match", ""):
+            await self._send(writer, 304, response_headers, b"", keep_alive)
+            return
+
+        response_headers["Content-Type"] = asset.content_type
+        if gzipped:
+            response_headers["Content-Encoding"] = "gzip"
+            body = asset.gzip_body
+        else:
+            body = asset.body
+        if body is not None:
+            await self._send(writer, 200, response_headers, b"" if method == "HEAD" else body, keep_alive, len(body))
+            return
+
+        with open(asset.path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            await self._send(writer, 200, response_headers, b"", keep_alive, size)
+            if method == "GET":
+                await asyncio.get_running_loop().sendfile(writer.transport, f)  # Zero-copy where the OS allows
+
+    @staticmethod
+    async def _send(writer, status, headers, body, keep_alive, length=None):
+        reasons = {200: "OK", 304: "Not Modified", 404: "Not Found", 405: "Method Not Allowed"}
+        lines = [f"HTTP/1.1 {status} {reasons[status]}"]
+        lines += [f"{name}: {value}" for name, value in headers.items()]
+        if status != 304:
+            lines.append(f"Content-Length: {len(body) if length is None else length}")
+        lines.append(f"Connection: {'keep-alive' if keep_alive else 'close'}")
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body)
+        await writer.drain()
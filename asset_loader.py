@@ -0,0 +1,68 @@
+import pygame
+from PIL import Image, ImageSequence
+
+from image_decode import decode_scaled
+from raw_cache import RawFrameCache
+
+
+def display_format(surface):
+    """Return surface in the display's pixel format, keeping per-pixel alpha only if it has it."""
+    if surface.get_flags() & pygame.SRCALPHA:
+        return surface.convert_alpha()  # e.g. einhorn.png
+    return surface.convert()
+
+
+def load_image(source, size=None, asset_class="selection"):
+    """Load an image file (path or file object), optionally scaled to size, as a display-format surface.
+
+    Scaled loads go through decode_scaled, which decodes JPEGs close to size
+    and finishes with the resampling filter of asset_class.
+    """
+    if size is None:
+        return display_format(pygame.image.load(source))
+    image = decode_scaled(source, size, asset_class)
+    return display_format(pygame.image.frombytes(image.tobytes(), image.size, image.mode))
+
+
+def load_gif_frames(path, size):
+    """Load every frame of a GIF, scaled to size, as display-format surfaces."""
+    with Image.open(path) as gif:
+        # Palette frames are expanded to RGB, pygame would otherwise drop the palette
+        frames = [frame.convert("RGB") for frame in ImageSequence.Iterator(gif)]
+    return [
+        display_format(pygame.transform.scale(pygame.image.fromstring(frame.tobytes(), frame.size, "RGB"), size))
+        for frame in frames
+    ]
+
+
+class AssetCache:
+    """On-disk cache of scaled startup assets, keyed by source mtime, scaling factor and screen size.
+
+    Entries hold zlib-compressed raw pixels, so a warm boot skips JPEG/GIF
+    decoding and scaling. Without a cache_dir every load decodes the source.
+    Safe to use from several threads at once.
+    """
+
+    def __init__(self, cache_dir, scaling_factor, screen_size):
+        self.raw_cache = RawFrameCache(cache_dir, f"pygame|{scaling_factor}|{tuple(screen_size)}")
+
+    def load_image(self, path, size, asset_class):
+        """Cached equivalent of load_image(path, size, asset_class)."""
+        return self._load(path, size, asset_class, lambda: [load_image(path, size, asset_class)])[0]
+
+    def load_gif_frames(self, path, size):
+        """Cached equivalent of load_gif_frames(path, size)."""
+        return self._load(path, size, "animation", lambda: load_gif_frames(path, size))
+
+    def _load(self, path, size, asset_class, decode):
+        cached = self.raw_cache.read(path, size, asset_class)
+        if cached is not None:
+            frame_size, alpha, pixels = cached
+            fmt = "RGBA" if alpha else "RGB"
+            return [display_format(pygame.image.frombytes(data, frame_size, fmt)) for data in pixels]
+
+        frames = decode()
+        alpha = bool(frames[0].get_flags() & pygame.SRCALPHA)
+        fmt = "RGBA" if alpha else "RGB"
+        self.raw_cache.write(path, size, asset_class, frames[0].get_size(), alpha, [pygame.image.tobytes(frame, fmt) for frame in frames])
+        return frames
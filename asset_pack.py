@@ -0,0 +1,139 @@
+import json
+import mmap
+import os
+import struct
+
+import pygame
+
+PACK_MAGIC = b"FSNP"
+PACK_VERSION = 2  # Bumped whenever the loaders change the pixels they produce
+PACK_HEADER = struct.Struct("<4sHI")  # magic, version, length of the JSON index that follows
+PACK_ALIGN = 64  # Pixel data starts on cache-line boundaries
+
+
+def buffer_format(surface):
+    """Name the pygame.image.frombuffer format that matches surface's memory layout, or None."""
+    if surface.get_bitsize() != 32:
+        return None  # e.g. a 16-bit framebuffer, frombuffer has no such format
+    formats = {
+        (0xFF0000, 0xFF00, 0xFF): "BGRA",
+        (0xFF, 0xFF00, 0xFF0000): "RGBA",
+        (0xFF00, 0xFF0000, 0xFF000000): "ARGB",
+    }
+    return formats.get(tuple(surface.get_masks()[:3]))
+
+
+def display_formats():
+    """frombuffer formats of opaque and per-pixel alpha surfaces on the current display."""
+    opaque = buffer_format(pygame.display.get_surface())
+    alpha = buffer_format(pygame.Surface((1, 1), pygame.SRCALPHA).convert_alpha())
+    return {"opaque": opaque, "alpha": alpha}
+
+
+def source_stamp(path):
+    """Identify one version of a source file."""
+    stat = os.stat(path)
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def write_pack(pack_path, assets, sources, screen_size, scaling_factor):
+    """Write display-format pixels of assets ({name: [surfaces]}) into one pack file.
+
+    sources maps each name to the file it was decoded from, so that a pack
+    built from older files is recognised as stale.
+    """
+    formats = display_formats()
+    index = {
+        "screen_size": list(screen_size),
+        "scaling_factor": scaling_factor,
+        "formats": formats,
+        "entries": {},
+    }
+    chunks = []
+    offset = 0
+    for name, frames in assets.items():
+        alpha = bool(frames[0].get_flags() & pygame.SRCALPHA)
+        fmt = formats["alpha" if alpha else "opaque"]
+        if fmt is None:
+            print(f"Warning: Display format not supported by the asset pack, not writing {pack_path}")
+            return
+        pixels = b"".join(pygame.image.tobytes(frame, fmt) for frame in frames)
+        padding = -offset % PACK_ALIGN
+        chunks.append(bytes(padding))
+        offset += padding
+        index["entries"][name] = {
+            "source": source_stamp(sources[name]),
+            "size": list(frames[0].get_size()),
+            "count": len(frames),
+            "format": fmt,
+            "alpha": alpha,
+            "offset": offset,
+        }
+        chunks.append(pixels)
+        offset += len(pixels)
+
+    index_bytes = json.dumps(index).encode()
+    index_bytes += b" " * (-(PACK_HEADER.size + len(index_bytes)) % PACK_ALIGN)  # Pixel data follows, aligned
+
+    tmp_path = f"{pack_path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(PACK_HEADER.pack(PACK_MAGIC, PACK_VERSION, len(index_bytes)))
+            f.write(index_bytes)
+            for chunk in chunks:
+                f.write(chunk)
+        os.replace(tmp_path, pack_path)  # A running kiosk keeps its mapping of the old pack
+    except OSError as e:
+        print(f"Warning: Could not write asset pack {pack_path}: {e}")
+
+
+class AssetPack:
+    """Memory-mapped pack of startup assets; surfaces share the mapped pixels instead of copying them.
+
+    The mapping stays open for as long as any of its surfaces is alive.
+    """
+
+    def __init__(self, pack_path):
+        with open(pack_path, "rb") as f:
+            # Private mapping: pages are read lazily, and a stray draw onto a
+            # pack surface changes this process's copy rather than failing
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+        magic, version, index_length = PACK_HEADER.unpack_from(self._mmap)
+        if magic != PACK_MAGIC or version != PACK_VERSION:
+            raise ValueError(f"{pack_path} is not an asset pack")
+        self.index = json.loads(bytes(self._mmap[PACK_HEADER.size:PACK_HEADER.size + index_length]))
+        self._data = memoryview(self._mmap)[PACK_HEADER.size + index_length:]
+
+    @classmethod
+    def open(cls, pack_path):
+        """Return the pack at pack_path, or None if it is missing or unreadable."""
+        try:
+            return cls(pack_path)
+        except (OSError, ValueError, KeyError, struct.error):
+            return None
+
+    def matches(self, sources, screen_size, scaling_factor):
+        """True if the pack holds exactly sources ({name: path}), unchanged, for this display."""
+        if (self.index["screen_size"] != list(screen_size)
+                or self.index["scaling_factor"] != scaling_factor
+                or self.index["formats"] != display_formats()
+                or self.index["entries"].keys() != sources.keys()):
+            return False
+        try:
+            return all(entry["source"] == source_stamp(sources[name]) for name, entry in self.index["entries"].items())
+        except OSError:
+            return False
+
+    def frames(self, name):
+        """Surfaces of one asset, backed directly by the mapped file."""
+        entry = self.index["entries"][name]
+        size = tuple(entry["size"])
+        frame_bytes = size[0] * size[1] * 4
+        frames = []
+        for i in range(entry["count"]):
+            start = entry["offset"] + i * frame_bytes
+            surface = pygame.image.frombuffer(self._data[start:start + frame_bytes], size, entry["format"])
+            if not entry["alpha"]:
+                surface.set_alpha(None)  # Opaque: blit as a plain copy, like a convert()ed surface
+            frames.append(surface)
+        return frames
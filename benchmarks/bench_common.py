@@ -0,0 +1,37 @@
+"""Shared setup for the headless benchmarks in this directory."""
+import importlib
+import os
+import sys
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+IMAGE_DIR = os.path.join(BASE_DIR, "Images", "Grid")
+SELECTIONS_DIR = os.path.join(BASE_DIR, "Images", "Selections")
+LOADING_GIF_PATH = os.path.join(BASE_DIR, "Images", "Other", "loading.gif")
+BACKGROUND_PATH = os.path.join(BASE_DIR, "Images", "Other", "background_2.jpg")
+
+from pair_catalog import FILE_NAMES, LABELS, PRIORITY_LIST  # Importable once BASE_DIR is on sys.path
+
+
+def make_app(module_name="newstable", **kwargs):
+    """Build the newstable.py (or testing.py) app without entering its main loop."""
+    module = importlib.import_module(module_name)
+
+    class BenchApp(module.PictureGridApp):
+        def main_loop(self):
+            pass  # Benchmarks drive step() themselves
+
+    kwargs.setdefault("scaling_factor", 1.37)
+    kwargs.setdefault("loading_gif_path", LOADING_GIF_PATH)
+    kwargs.setdefault("background_path", BACKGROUND_PATH)
+    return BenchApp(IMAGE_DIR, None, None, SELECTIONS_DIR, FILE_NAMES, LABELS, PRIORITY_LIST, **kwargs)
+
+
+def event_loop(app):
+    """The app's single main loop, without the shutdown main_loop() does at the end."""
+    while app.running:
+        app.step()
@@ -0,0 +1,54 @@
+"""Compare blit times of surfaces as loaded versus converted to the display pixel format.
+
+Grid: the 20 thumbnails blitted once each. Selection: one full-screen
+combination image. Runs headless by default:
+
+    python benchmarks/blit_format.py --repeat 200
+"""
+import argparse
+import os
+import timeit
+
+from bench_common import FILE_NAMES, IMAGE_DIR, SELECTIONS_DIR
+
+import pygame
+from asset_loader import display_format
+
+
+def load_raw(path, size):
+    """How images were loaded before: whatever format pygame.image.load returns."""
+    return pygame.transform.scale(pygame.image.load(path), size)
+
+
+def time_blits(screen, surfaces, repeat):
+    """Average milliseconds to blit all surfaces once."""
+    def blit_all():
+        for surface in surfaces:
+            screen.blit(surface, (0, 0))
+    return 1000 * timeit.timeit(blit_all, number=repeat) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    pygame.init()
+    screen = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
+    square = min(screen.get_size())
+    thumbnail = (int(139 * 1.37), int(139 * 1.37))
+
+    grid_raw = [load_raw(os.path.join(IMAGE_DIR, name), thumbnail) for name in FILE_NAMES]
+    selection_raw = [load_raw(os.path.join(SELECTIONS_DIR, "hexe-affe.jpg"), (square, square))]
+
+    print(f"display: {screen.get_bitsize()} bpp, {screen.get_size()[0]}x{screen.get_size()[1]}")
+    print(f"{'workload':<12} {'as loaded':>12} {'display fmt':>12} {'speed-up':>9}")
+    for workload, raw in (("grid (20)", grid_raw), ("selection", selection_raw)):
+        before = time_blits(screen, raw, args.repeat)
+        after = time_blits(screen, [display_format(surface) for surface in raw], args.repeat)
+        print(f"{workload:<12} {before:>10.3f}ms {after:>10.3f}ms {before / after:>8.1f}x")
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Compare full JPEG decodes with draft-mode (DCT-scaled) decodes, per asset class.
+
+Both variants finish with the same filter from image_decode.RESAMPLE_FILTERS,
+so the difference is the decode alone. Square sizes are those of a 1080p
+HDMI screen and of the 800x480 official Pi touchscreen:
+
+    python benchmarks/decode_scaled.py --repeat 5
+"""
+import argparse
+import os
+import timeit
+
+from bench_common import BACKGROUND_PATH, FILE_NAMES, IMAGE_DIR, SELECTIONS_DIR
+
+from PIL import Image
+from image_decode import RESAMPLE_FILTERS, decode_scaled
+
+THUMBNAIL_SIZE = int(139 * 1.37)  # newstable.py / testing.py at scaling_factor=1.37
+
+
+def decode_full(path, size, asset_class):
+    """Decode every pixel, then resize: what the loaders did before draft mode."""
+    with Image.open(path) as image:
+        return image.resize(size, RESAMPLE_FILTERS[asset_class])
+
+
+def time_class(paths, size, asset_class, repeat):
+    """Best-of-repeat milliseconds per image for the full and the draft-mode decode."""
+    def run(decode):
+        return timeit.timeit(lambda: [decode(path, size, asset_class) for path in paths], number=1)
+    full = draft = float("inf")
+    for _ in range(repeat):  # Interleaved, so both see the same page cache and CPU clock
+        full = min(full, run(decode_full))
+        draft = min(draft, run(decode_scaled))
+    return 1000 * full / len(paths), 1000 * draft / len(paths)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--selections", type=int, default=40, help="combination images to sample")
+    args = parser.parse_args()
+
+    thumbnails = [os.path.join(IMAGE_DIR, name) for name in FILE_NAMES if name.endswith(".jpg")]
+    selections = sorted(os.path.join(SELECTIONS_DIR, name) for name in os.listdir(SELECTIONS_DIR) if name.endswith(".jpg"))
+    selections = selections[:args.selections]
+
+    print(f"{'asset class':<12} {'images':>6} {'target':>10} {'full ms':>8} {'draft ms':>9} {'saving':>7}")
+    for square in (1080, 480):
+        workload = [
+            ("thumbnail", thumbnails, (THUMBNAIL_SIZE, THUMBNAIL_SIZE)),
+            ("background", [BACKGROUND_PATH], (square, square)),
+            ("selection", selections, (square, square)),
+        ]
+        for asset_class, paths, size in workload:
+            full, draft = time_class(paths, size, asset_class, args.repeat)
+            target = f"{size[0]}x{size[1]}"
+            print(f"{asset_class:<12} {len(paths):>6} {target:>10} {full:>8.2f} {draft:>9.2f} {1 - draft / full:>7.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Measure how fast testing.py reacts to the lock switch, and that it sleeps in between.
+
+Runs headless with a SimulatedSwitch in place of RPi.GPIO. A background
+thread flips the switch; latency is the time from the edge until the lock
+screen (or the grid) has been drawn:
+
+    python benchmarks/gpio_latency.py --toggles 20
+"""
+import argparse
+import statistics
+import threading
+import time
+
+from bench_common import event_loop, make_app
+
+import pygame
+from gpio_switch import SimulatedSwitch
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--toggles", type=int, default=20)
+    parser.add_argument("--idle-seconds", type=float, default=2.0)
+    args = parser.parse_args()
+
+    switch = SimulatedSwitch()
+    app = make_app("testing", switch=switch)
+
+    # Note when each screen change has been drawn, and count loop iterations. The lock
+    # screen is flipped by show_forced_selection; the grid by the next renderer.render()
+    drawn = threading.Event()
+    steps = [0]
+    show_forced_selection = app.show_forced_selection
+    render = app.renderer.render
+
+    def drawn_forced_selection():
+        show_forced_selection()
+        drawn.set()
+
+    def drawn_render():
+        if render():
+            drawn.set()
+            return True
+        return False
+    app.show_forced_selection = drawn_forced_selection
+    app.renderer.render = drawn_render
+    step = app.step
+
+    def counting_step():
+        steps[0] += 1
+        step()
+    app.step = counting_step
+
+    latencies = {True: [], False: []}
+    idle_steps = []
+
+    def drive():
+        time.sleep(0.5)  # Let the first grid frame settle
+        for i in range(args.toggles):
+            high = i % 2 == 0
+            drawn.clear()
+            start = time.perf_counter()
+            switch.set(high)
+            drawn.wait(5)
+            latencies[high].append(1000 * (time.perf_counter() - start))
+            time.sleep(0.1)  # Past the settle re-check
+
+        before = steps[0]
+        time.sleep(args.idle_seconds)
+        idle_steps.append(steps[0] - before)
+        pygame.event.post(pygame.event.Event(pygame.QUIT))
+
+    driver = threading.Thread(target=drive)
+    driver.start()
+    event_loop(app)
+    driver.join()
+    app.prefetcher.shutdown()
+    pygame.quit()
+
+    for high, label in ((True, "lock screen"), (False, "back to grid")):
+        values = latencies[high]
+        print(f"{label:<13} median {statistics.median(values):6.2f} ms  max {max(values):6.2f} ms  ({len(values)} edges)")
+    print(f"loop wake-ups while idle: {idle_steps[0] / args.idle_seconds:.1f}/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Measure how much CPU the pygame kiosk uses while nobody touches it.
+
+Runs headless (SDL dummy driver) and compares the old polling loops, which
+redrew the grid at 30 fps and spun on pygame.event.get() behind the Back
+button, with the event-driven loops in newstable.py:
+
+    python benchmarks/idle_cpu.py --seconds 10
+"""
+import argparse
+import threading
+import time
+
+from bench_common import event_loop, make_app
+
+import pygame
+
+
+def legacy_grid_loop(app):
+    """The grid loop as it was: full redraw and flip at 30 fps."""
+    clock = pygame.time.Clock()
+    while app.running:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                app.running = False
+        app.screen.fill((0, 0, 0))
+        if app.background_image:
+            app.screen.blit(app.background_image, (app.square_x, app.square_y))
+        app.display_banner(app.screen)
+        app.display_image_grid(app.screen)
+        pygame.display.flip()
+        clock.tick(30)
+
+
+def legacy_selection_wait(app):
+    """The Back button wait as it was: spinning on pygame.event.get()."""
+    waiting = True
+    while waiting:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                waiting = False
+
+
+def measure(loop, seconds):
+    """Run loop until a QUIT is posted after seconds; return CPU use in % of one core."""
+    timer = threading.Timer(seconds, pygame.event.post, (pygame.event.Event(pygame.QUIT),))
+    wall_start, cpu_start = time.perf_counter(), time.process_time()
+    timer.start()
+    loop()
+    timer.join()
+    return 100 * (time.process_time() - cpu_start) / (time.perf_counter() - wall_start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=10, help="idle time per measurement")
+    args = parser.parse_args()
+
+    app = make_app()
+
+    # Decode the combination up front so only the waiting is measured
+    app.clicked_images = {"hexe.jpg", "affe.jpg"}
+    app.show_loading_screen()
+    app.pending_selection.result()
+
+    def run(loop):
+        app.running = True
+        return measure(loop, args.seconds)
+
+    selection_before = run(lambda: legacy_selection_wait(app))
+    app.show_selection_screen()  # Skip the rest of the loading animation
+    selection_after = run(lambda: event_loop(app))
+
+    app.reset_selection()
+    grid_before = run(lambda: legacy_grid_loop(app))
+    grid_after = run(lambda: event_loop(app))
+
+    print(f"{'screen':<10} {'before (polling)':>18} {'after (event wait)':>20}")
+    for screen, before, after in (("grid", grid_before, grid_after), ("selection", selection_before, selection_after)):
+        print(f"{screen:<10} {before:>17.1f}% {after:>19.1f}%")
+
+
+if __name__ == "__main__":
+    main()
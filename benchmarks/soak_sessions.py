@@ -0,0 +1,81 @@
+"""Soak test for the pygame kiosk: run thousands of visitor sessions and watch memory.
+
+Each session taps two random tiles, lets the loading screen finish, and
+presses Back, all through the app's single main loop (newstable.py). The
+Python heap and RSS are reported every --report sessions; the run fails if
+the heap keeps growing once the selection cache has warmed up:
+
+    python benchmarks/soak_sessions.py --sessions 10000
+"""
+import argparse
+import random
+import sys
+import threading
+import tracemalloc
+
+from bench_common import make_app
+
+import pygame
+from screens import Screen
+
+
+def rss_mb():
+    """Resident set size of this process in MB (Linux)."""
+    with open("/proc/self/status") as status:
+        for line in status:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return float("nan")
+
+
+def tap(app, pos):
+    """Queue a tap and let the main loop handle it."""
+    pygame.event.post(pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=pos, button=1))
+    app.step()
+
+
+def run_session(app, rng):
+    """One visitor: two tiles, the loading screen, the result and Back."""
+    first, second = rng.sample(range(len(app.file_names)), 2)
+    tap(app, app.tile_rect(first).center)
+    tap(app, app.tile_rect(second).center)
+    while app.screen_state is Screen.LOADING:
+        app.step()
+    if app.screen_state is Screen.SELECTION:
+        tap(app, app.back_button_rect.center)
+    assert app.screen_state is Screen.GRID and not app.clicked_images
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=10000)
+    parser.add_argument("--report", type=int, default=1000, help="sessions between memory reports")
+    parser.add_argument("--cache-mb", type=float, default=64, help="selection cache budget")
+    parser.add_argument("--max-growth-kb", type=float, default=512, help="allowed heap growth after warm-up")
+    args = parser.parse_args()
+
+    app = make_app(loading_duration=0, selection_cache_mb=args.cache_mb)
+    rng = random.Random(2025)
+    tracemalloc.start()
+
+    print(f"{'sessions':>8} {'heap MB':>9} {'RSS MB':>8} {'threads':>8} {'cache':>6}")
+    baseline = None
+    for session in range(1, args.sessions + 1):
+        run_session(app, rng)
+        if session % args.report == 0:
+            heap = tracemalloc.get_traced_memory()[0]
+            baseline = heap if baseline is None else baseline
+            print(f"{session:>8} {heap / 2**20:>9.2f} {rss_mb():>8.1f} {threading.active_count():>8} {len(app.selection_cache):>6}")
+
+    growth_kb = (heap - baseline) / 1024
+    app.prefetcher.shutdown()
+    pygame.quit()
+    print(f"Heap growth after the first {args.report} sessions: {growth_kb:.1f} KB")
+    if growth_kb > args.max_growth_kb:
+        print("FAIL: memory keeps growing across sessions")
+        sys.exit(1)
+    print("OK: memory is flat")
+
+
+if __name__ == "__main__":
+    main()
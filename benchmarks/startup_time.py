@@ -0,0 +1,56 @@
+"""Time from constructing the pygame app to the first grid frame, cold and warm.
+
+Cold: every startup asset is decoded and scaled (and written to a fresh
+asset cache and pack). Warm cache: the assets are read pre-scaled from
+that cache, as when the pack is stale. Pack: the pack is memory-mapped,
+as on every boot after the first:
+
+    python benchmarks/startup_time.py
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from bench_common import make_app
+
+import pygame
+
+
+def time_to_grid(cache_dir, use_pack=True):
+    """Seconds until the app has painted its first grid frame."""
+    if cache_dir and not use_pack and os.path.exists(os.path.join(cache_dir, "startup.pack")):
+        os.remove(os.path.join(cache_dir, "startup.pack"))
+    start = time.perf_counter()
+    app = make_app(asset_cache_dir=cache_dir)
+    app.renderer.render()
+    elapsed = time.perf_counter() - start
+    if app.loading_frames_future is not None:
+        app.loading_frames_future.result()  # Still loading in the background, let it finish
+    if app.asset_pack_future is not None:
+        app.asset_pack_future.result()
+    app.prefetcher.shutdown()
+    pygame.quit()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--warm-runs", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        uncached = time_to_grid(None)
+        cold = time_to_grid(cache_dir)
+        warm = min(time_to_grid(cache_dir, use_pack=False) for _ in range(args.warm_runs))
+        time_to_grid(cache_dir)  # Writes the pack again
+        packed = min(time_to_grid(cache_dir) for _ in range(args.warm_runs))
+
+    print(f"no asset cache:  {uncached:.3f}s")
+    print(f"cold (filling):  {cold:.3f}s")
+    print(f"warm cache:      {warm:.3f}s")
+    print(f"pack:            {packed:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
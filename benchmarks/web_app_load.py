@@ -0,0 +1,114 @@
+"""Load-test the Flask web_app: page views per second and bytes per page view.
+
+Serves web_app/app.py from a separate process and has a few simulated
+kiosks load the page over and over. Like a browser, each kiosk loads the
+page and every stylesheet, script and image it links to, keeps what it got,
+revalidates with If-None-Match and skips what was sent as immutable:
+
+    python benchmarks/web_app_load.py --clients 4 --seconds 10
+"""
+import argparse
+import gzip
+import http.client
+import logging
+import multiprocessing
+import re
+import sys
+import threading
+import time
+
+from bench_common import BASE_DIR
+
+STATIC_URL = re.compile(r'(?:src|href)="(/static/[^"]+)"')
+
+
+def serve(port, ready):
+    sys.path.insert(0, f"{BASE_DIR}/web_app")
+    from werkzeug.serving import make_server
+    from app import app
+
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)  # No line per request
+    server = make_server("127.0.0.1", port, app, threaded=True)
+    ready.set()
+    server.serve_forever()
+
+
+class Kiosk:
+    """A browser with an HTTP cache, loading the page over and over."""
+
+    def __init__(self, port):
+        self.port = port
+        self.cache = {}  # url -> (etag, immutable, body)
+
+    def get(self, url):
+        """Fetch url through the cache; return (body, bytes on the wire, requests made)."""
+        etag, immutable, body = self.cache.get(url, (None, False, None))
+        if immutable:
+            return body, 0, 0
+        connection = http.client.HTTPConnection("127.0.0.1", self.port)
+        headers = {"Accept-Encoding": "gzip"}
+        if etag:
+            headers["If-None-Match"] = etag
+        connection.request("GET", url, headers=headers)
+        response = connection.getresponse()
+        data = response.read()
+        wire = len(data) + sum(len(name) + len(value) + 4 for name, value in response.getheaders())
+        connection.close()
+        if response.status == 200:
+            if response.getheader("Content-Encoding") == "gzip":
+                data = gzip.decompress(data)
+            cache_control = response.getheader("Cache-Control") or ""
+            self.cache[url] = (response.getheader("ETag"), "immutable" in cache_control, data)
+            return data, wire, 1
+        return body, wire, 1
+
+    def page_view(self):
+        """Load the page and everything it links to; return (bytes on the wire, requests made)."""
+        html, wire, requests = self.get("/")
+        for url in STATIC_URL.findall(html.decode("utf-8")):
+            _, url_wire, url_requests = self.get(url)
+            wire += url_wire
+            requests += url_requests
+        return wire, requests
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--port", type=int, default=5051)
+    args = parser.parse_args()
+
+    ready = multiprocessing.Event()
+    server = multiprocessing.Process(target=serve, args=(args.port, ready), daemon=True)
+    server.start()
+    ready.wait(30)
+
+    first_view = Kiosk(args.port).page_view()
+    results = []  # (wire bytes, requests) per repeat page view
+    deadline = time.perf_counter() + args.seconds
+
+    def run():
+        kiosk = Kiosk(args.port)
+        kiosk.page_view()  # Fill its cache
+        while time.perf_counter() < deadline:
+            results.append(kiosk.page_view())
+
+    threads = [threading.Thread(target=run) for _ in range(args.clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    server.terminate()
+
+    requests = sum(count for _, count in results)
+    print(f"first page view:   {first_view[0] / 1024:9.1f} KiB in {first_view[1]} requests")
+    print(f"repeat page view:  {sum(wire for wire, _ in results) / len(results) / 1024:9.1f} KiB in {requests / len(results):.1f} requests")
+    print(f"page views/s:      {len(results) / elapsed:9.1f}  ({args.clients} clients)")
+    print(f"requests/s:        {requests / elapsed:9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+import html
+import json
+import os
+
+from pair_catalog import FILE_NAMES, LABELS, PRIORITY_LIST, PairCatalog, list_selections
+
+PAGE = """<!DOCTYPE html>
+<!-- Generated by build_web_index.py from pair_catalog.py and style.css; rerun it instead of editing this file -->
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Fasnacht App</title>
+{preloads}
+    <style>
+{style}
+    </style>
+</head>
+<body>
+    <div class="square-block">
+        <div class="banner">
+            <div class="banner-text">Randomisiere zwei Mottos - Randomize two Themes</div>
+        </div>
+        <div class="grid-container">
+{tiles}
+        </div>
+    </div>
+
+    <div class="loading-screen" id="loadingScreen" aria-hidden="true">
+        <img src="Images/Other/loading.gif" alt="Loading animation" draggable="false">
+    </div>
+
+    <div class="selection-screen" id="selectionScreen" aria-hidden="true">
+        <img id="combinedImage" src="" alt="Combined theme selection">
+        <button id="backButton" class="back-button" aria-label="Return to theme selection">Back</button>
+    </div>
+    <script>window.COMBINATIONS = {combinations};</script>
+    <script src="script.js"></script>
+</body>
+</html>
+"""
+
+TILE = """            <div class="grid-item" data-filename="{name}" data-priority="{priority}">
+                <img src="Images/Grid/{name}" alt="{label}" draggable="false" class="scale-on-touch">
+                <div class="image-label">{label}</div>
+            </div>"""
+
+
+def web_file_names(file_names, grid_dir):
+    """The Web_2.0 grid file for each frontend file name: the .webp, else one with the frontend's extension.
+
+    Raises ValueError when a grid image has no such file, or several and none of them preferred.
+    """
+    by_stem = {}
+    for name in sorted(os.listdir(grid_dir)):
+        by_stem.setdefault(os.path.splitext(name)[0], []).append(name)
+    web_names = []
+    for file_name in file_names:
+        stem = os.path.splitext(file_name)[0]
+        candidates = by_stem.get(stem, [])
+        for preferred in (f"{stem}.webp", file_name):
+            if preferred in candidates:
+                web_names.append(preferred)
+                break
+        else:
+            if len(candidates) != 1:
+                raise ValueError(f"No unambiguous image for {file_name} in {grid_dir}: {candidates}")
+            web_names.append(candidates[0])
+    return web_names
+
+
+def render_index(web_dir):
+    """The prerendered index.html: static tiles, inlined CSS, preloaded grid images, pair map."""
+    file_names = web_file_names(FILE_NAMES, os.path.join(web_dir, "Images", "Grid"))
+    selections_dir = os.path.join(web_dir, "Images", "Selections")
+    catalog = PairCatalog(file_names, PRIORITY_LIST, selections_dir, list_selections(selections_dir), extension=".webp")
+    catalog.report()
+
+    # script.js looks a pair up by its two grid file names, sorted and joined with "|"
+    combinations = {"|".join(sorted(entry.pair)): entry.name for entry in catalog.entries()}
+    with open(os.path.join(web_dir, "style.css"), encoding="utf-8") as f:
+        style = f.read().strip()
+
+    return PAGE.format(
+        preloads="\n".join(f'    <link rel="preload" as="image" href="Images/Grid/{name}">' for name in file_names),
+        style="\n".join(f"        {line}" if line else "" for line in style.splitlines()),
+        tiles="\n".join(TILE.format(name=name, priority=priority, label=html.escape(label))
+                        for name, label, priority in zip(file_names, LABELS, PRIORITY_LIST)),
+        combinations=json.dumps(combinations, ensure_ascii=False, separators=(",", ":")),
+    )
+
+
+if __name__ == "__main__":
+    WEB_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Web_2.0")
+    INDEX_PATH = os.path.join(WEB_DIR, "index.html")
+
+    with open(INDEX_PATH, "w", encoding="utf-8") as f:
+        f.write(render_index(WEB_DIR))
+    print(f"Wrote {INDEX_PATH}")
@@ -0,0 +1,54 @@
+import pygame
+
+
+class DirtyRenderer:
+    """Track changed screen regions and push only those to the display."""
+
+    def __init__(self, screen, redraw):
+        self.screen = screen
+        self.redraw = redraw  # Callable (rect) that repaints everything inside rect
+        self._dirty_rects = []
+        self._full_redraw = True
+
+    @property
+    def dirty(self):
+        return self._full_redraw or bool(self._dirty_rects)
+
+    def invalidate(self, rect=None):
+        """Mark a region as changed; without a rect the whole screen is redrawn."""
+        if rect is None:
+            self._full_redraw = True
+            self._dirty_rects = []
+        elif not self._full_redraw:
+            self._dirty_rects.append(pygame.Rect(rect))
+
+    def render(self):
+        """Repaint and update the changed regions. Returns True if anything was drawn."""
+        if self._full_redraw:
+            self.redraw(self.screen.get_rect())
+            pygame.display.flip()
+        elif self._dirty_rects:
+            rects = self._merge(self._dirty_rects)
+            for rect in rects:
+                self.screen.set_clip(rect)
+                self.redraw(rect)
+            self.screen.set_clip(None)
+            pygame.display.update(rects)
+        else:
+            return False
+
+        self._full_redraw = False
+        self._dirty_rects = []
+        return True
+
+    @staticmethod
+    def _merge(rects):
+        """Fold overlapping rects together to avoid repainting shared pixels."""
+        merged = []
+        for rect in rects:
+            for other in merged[:]:
+                if rect.colliderect(other):
+                    rect = rect.union(other)
+                    merged.remove(other)
+            merged.append(rect)
+        return merged
@@ -0,0 +1,50 @@
+import pygame
+
+WAKE_EVENT = pygame.event.custom_type()
+
+
+class EventScheduler:
+    """Sleep in pygame.event.wait until input arrives or a scheduled timer is due."""
+
+    def __init__(self):
+        self._timers = {}  # name -> tick at which it is due
+
+    def schedule(self, name, delay_ms):
+        """(Re)arm a named timer, e.g. the next frame of an animation."""
+        self._timers[name] = pygame.time.get_ticks() + delay_ms
+
+    def cancel(self, name=None):
+        """Disarm one named timer, or all of them."""
+        if name is None:
+            self._timers.clear()
+        else:
+            self._timers.pop(name, None)
+
+    def notify(self, name):
+        """Wake wait() from any thread; name is reported like a timer that became due."""
+        if pygame.get_init():
+            pygame.event.post(pygame.event.Event(WAKE_EVENT, name=name))
+
+    def wait(self):
+        """Block until something happens. Returns (events, names of timers that became due)."""
+        timeout = self._timeout()
+        if timeout is None:
+            first = pygame.event.wait()
+        elif timeout == 0:
+            first = pygame.event.poll()  # wait(0) would block forever
+        else:
+            first = pygame.event.wait(timeout)
+        events = [] if first.type == pygame.NOEVENT else [first] + pygame.event.get()
+
+        now = pygame.time.get_ticks()
+        due = [name for name, tick in self._timers.items() if tick <= now]
+        for name in due:
+            del self._timers[name]
+        due += [event.name for event in events if event.type == WAKE_EVENT]
+        return [event for event in events if event.type != WAKE_EVENT], due
+
+    def _timeout(self):
+        """Milliseconds until the next timer, or None to sleep until input."""
+        if not self._timers:
+            return None
+        return max(0, min(self._timers.values()) - pygame.time.get_ticks())
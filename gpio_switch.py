@@ -0,0 +1,52 @@
+import threading
+
+
+class RPiSwitch:
+    """The lock switch on a Raspberry Pi pin, reported through RPi.GPIO edge detection."""
+
+    def __init__(self, pin=2, bouncetime_ms=50):
+        import RPi.GPIO as GPIO  # Only on the Pi; SimulatedSwitch stands in elsewhere
+
+        self._gpio = GPIO
+        self.pin = pin
+        self.bouncetime_ms = bouncetime_ms
+        GPIO.setmode(GPIO.BCM)
+        GPIO.setup(pin, GPIO.IN, pull_up_down=GPIO.PUD_UP)  # Internal pull-up
+
+    def is_high(self):
+        return self._gpio.input(self.pin) == self._gpio.HIGH
+
+    def on_change(self, callback):
+        """Call callback() from RPi.GPIO's thread on every debounced edge."""
+        self._gpio.add_event_detect(self.pin, self._gpio.BOTH, callback=lambda channel: callback(), bouncetime=self.bouncetime_ms)
+
+    def close(self):
+        self._gpio.cleanup()
+
+
+class SimulatedSwitch:
+    """Stand-in for RPiSwitch on machines without RPi.GPIO; set() flips it from any thread."""
+
+    def __init__(self, high=False, bouncetime_ms=50):
+        self.bouncetime_ms = bouncetime_ms
+        self._high = high
+        self._callback = None
+        self._lock = threading.Lock()
+
+    def is_high(self):
+        with self._lock:
+            return self._high
+
+    def on_change(self, callback):
+        self._callback = callback
+
+    def set(self, high):
+        """Move the switch; like an edge on the pin, this calls back from the caller's thread."""
+        with self._lock:
+            changed = high != self._high
+            self._high = high
+        if changed and self._callback is not None:
+            self._callback()
+
+    def close(self):
+        self._callback = None
@@ -0,0 +1,25 @@
+from PIL import Image
+
+# Filter that finishes the resize, per asset class. Thumbnails shrink a lot and
+# are looked at closely; the full-square images are upscaled on most screens,
+# where BILINEAR costs about half of BICUBIC and looks the same from a step away.
+RESAMPLE_FILTERS = {
+    "thumbnail": Image.Resampling.LANCZOS,
+    "background": Image.Resampling.BILINEAR,
+    "selection": Image.Resampling.BILINEAR,
+}
+
+
+def decode_scaled(source, size, asset_class):
+    """Decode an image file (path or file object) and resize it to exactly size.
+
+    JPEGs are decoded in draft mode, which lets libjpeg scale by 1/2, 1/4
+    or 1/8 during the DCT as long as the result stays at least as big as
+    size; only the remaining factor is resampled.
+    """
+    with Image.open(source) as image:
+        if image.format == "JPEG":
+            image.draft("RGB", size)
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA" if "transparency" in image.info or image.mode == "LA" else "RGB")
+        return image.resize(size, RESAMPLE_FILTERS[asset_class])
@@ -1,10 +1,19 @@
+import io
 import os
+from concurrent.futures import ThreadPoolExecutor
 import pygame
 from pygame.locals import *
-from PIL import Image, ImageSequence
+from selection_cache import SurfaceCache, SelectionPrefetcher
+from dirty_renderer import DirtyRenderer
+from event_scheduler import EventScheduler
+from screens import Screen
+from asset_loader import AssetCache, load_image
+from asset_pack import AssetPack, write_pack
+from selection_archive import SelectionArchive
+from pair_catalog import FILE_NAMES, LABELS, PRIORITY_LIST, PairCatalog, list_selections
 
 class PictureGridApp:
-    def __init__(self, image_dir, banner_path, back_button_path, selections_dir, file_names, labels, priority_list, scaling_factor=1.0, loading_gif_path=None, background_path=None, loading_duration=2000):
+    def __init__(self, image_dir, banner_path, back_button_path, selections_dir, file_names, labels, priority_list, scaling_factor=1.0, loading_gif_path=None, background_path=None, loading_duration=2000, selection_cache_mb=192, asset_cache_dir=None, selection_archive_path=None):
         self.image_dir = image_dir
         self.banner_path = banner_path
         self.back_button_path = back_button_path
@@ -16,12 +25,20 @@ class PictureGridApp:
         self.loading_gif_path = loading_gif_path
         self.background_path = background_path
         self.loading_duration = loading_duration  # Duration in milliseconds
+        self.selection_cache_mb = selection_cache_mb  # Memory budget for decoded combination images
+        self.asset_cache_dir = asset_cache_dir  # Pre-scaled startup assets, None to always decode
+        self.asset_pack_path = os.path.join(asset_cache_dir, "startup.pack") if asset_cache_dir else None
+        # Combination images come from one mapped archive when it is built and current
+        self.selection_archive = SelectionArchive.open(selection_archive_path, selections_dir) if selection_archive_path else None
+        # Every pair is resolved once; a missing combination is reported now rather than when picked
+        self.catalog = PairCatalog(file_names, priority_list, selections_dir, list_selections(selections_dir, self.selection_archive))
+        self.catalog.report()
 
         # Initialize pygame
         pygame.init()
         self.screen = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
         self.screen_width, self.screen_height = self.screen.get_size()
-        self.clock = pygame.time.Clock()
+        self.scheduler = EventScheduler()  # Blocks on input instead of polling at a fixed frame rate
 
         # Set up colors
         self.grid_bg_color = (67, 135, 186)  # Blue color
@@ -44,56 +61,103 @@ class PictureGridApp:
         self.square_x = (self.screen_width - self.square_size) // 10
         self.square_y = (self.screen_height - self.square_size) // 2
 
-        # Set up images
+        # Set up thumbnails, loading screen and background
         self.image_cache = {}
-        self.pre_render_images()
-
-        # Set up loading screen
         self.loading_frames = []
-        self.setup_loading_screen()
-
-        # Set up background
+        self.loading_frames_future = None
+        self.asset_pack_future = None  # Rewrites a stale asset pack in the background
         self.background_image = None
-        self.setup_background()
+        self.load_startup_assets()
+
+        # Background, banner, thumbnails and labels are composited once
+        self.build_grid_layer()
 
         # Set up state
+        self.screen_state = Screen.GRID
         self.clicked_images = set()  # Use a set to track clicked images
         self.selected_frames = {}
+        self.pending_selection = None  # Future of the combination being decoded
+        self.back_button_rect = pygame.Rect(self.square_x + self.square_size - 210, self.square_y + self.square_size - 60, 200, 50)
+
+        # Decoded combinations, keyed on (pair, size); prefetched once a first tile is tapped
+        self.selection_cache = SurfaceCache(budget_mb=self.selection_cache_mb)
+        self.prefetcher = SelectionPrefetcher(self.selection_cache, self.load_selection)
+
+        # Only regions that changed are repainted and pushed to the display
+        self.renderer = DirtyRenderer(self.screen, self.draw_grid_screen)
 
         # Start the main loop
         self.running = True
         self.main_loop()
 
-    def setup_background(self):
-        """Set up the background image for the square block."""
-        if self.background_path and os.path.exists(self.background_path):
-            self.background_image = pygame.image.load(self.background_path)
-            self.background_image = pygame.transform.scale(self.background_image, (self.square_size, self.square_size))
-
-    def pre_render_images(self):
-        """Pre-render all images to the correct size and cache them."""
+    def load_startup_assets(self):
+        """Load the grid thumbnails, background and loading GIF.
+
+        A current asset pack is mapped straight into surfaces. Otherwise the
+        assets are loaded in parallel, each read pre-scaled from the on-disk
+        cache when possible and decoded (then cached) otherwise, and the pack
+        is rebuilt for the next boot. The grid does not wait for the GIF;
+        show_loading_screen picks its frames up when first needed.
+        """
+        sources = self.startup_asset_sources()
+        screen_size = (self.screen_width, self.screen_height)
+        pack = AssetPack.open(self.asset_pack_path) if self.asset_pack_path else None
+        if pack is not None and pack.matches(sources, screen_size, self.scaling_factor):
+            # Surfaces share the mapped pixels, nothing is decoded or copied
+            self.image_cache = {image_file: pack.frames(image_file)[0] for image_file in self.file_names if image_file in sources}
+            if "background" in sources:
+                self.background_image = pack.frames("background")[0]
+            if "loading" in sources:
+                self.loading_frames = pack.frames("loading")
+            return
+
+        asset_cache = AssetCache(self.asset_cache_dir, self.scaling_factor, screen_size)
+        square = (self.square_size, self.square_size)
+        pool = ThreadPoolExecutor(max_workers=os.cpu_count())
+
+        futures = {}
+        for image_file in self.file_names:
+            if image_file in sources:
+                futures[image_file] = pool.submit(asset_cache.load_image, sources[image_file], self.image_size, "thumbnail")
+        if "background" in sources:
+            futures["background"] = pool.submit(asset_cache.load_image, sources["background"], square, "background")
+
+        # Queued last, the grid only waits for the assets above
+        if "loading" in sources:
+            self.loading_frames_future = futures["loading"] = pool.submit(asset_cache.load_gif_frames, sources["loading"], square)
+        if self.asset_pack_path:
+            self.asset_pack_future = pool.submit(self.write_asset_pack, sources, futures)
+
+        self.image_cache = {image_file: futures[image_file].result() for image_file in self.file_names if image_file in sources}
+        if "background" in futures:
+            self.background_image = futures["background"].result()
+        pool.shutdown(wait=False)  # The GIF and the pack keep going in the background
+
+    def startup_asset_sources(self):
+        """Map each startup asset found on disk to its file: thumbnails by name, plus background and loading."""
+        sources = {}
         for image_file in self.file_names:
             image_path = os.path.join(self.image_dir, image_file)
             if os.path.exists(image_path):
-                img = pygame.image.load(image_path)
-                img = pygame.transform.scale(img, self.image_size)
-                self.image_cache[image_file] = img
+                sources[image_file] = image_path
             else:
                 print(f"Warning: File {image_file} not found in {self.image_dir}. Skipping.")
-
-    def setup_loading_screen(self):
-        """Set up the loading screen with a GIF or static text."""
+        if self.background_path and os.path.exists(self.background_path):
+            sources["background"] = self.background_path
         if self.loading_gif_path and os.path.exists(self.loading_gif_path):
-            self.loading_gif = Image.open(self.loading_gif_path)
-            self.loading_frames = [
-                pygame.image.fromstring(frame.tobytes(), frame.size, frame.mode)
-                for frame in ImageSequence.Iterator(self.loading_gif)
-            ]
-            self.loading_frames = [pygame.transform.scale(frame, (self.square_size, self.square_size)) for frame in self.loading_frames]
-            self.current_frame = 0
-
-    def display_banner(self):
-        """Display the banner at the top of the square block."""
+            sources["loading"] = self.loading_gif_path
+        return sources
+
+    def write_asset_pack(self, sources, futures):
+        """Store the loaded startup assets as one raw pack for the next boot to map."""
+        assets = {}
+        for name, future in futures.items():
+            loaded = future.result()
+            assets[name] = loaded if isinstance(loaded, list) else [loaded]  # GIFs load as a list of frames
+        write_pack(self.asset_pack_path, assets, sources, (self.screen_width, self.screen_height), self.scaling_factor)
+
+    def display_banner(self, surface):
+        """Draw the banner at the top of the square block onto surface."""
         banner_text = "Randomisiere zwei Mottos - Randomize two Themes"
         banner_surface = self.title_font.render(banner_text, True, (0, 0, 0))  # Black text
 
@@ -105,7 +169,7 @@ class PictureGridApp:
 
         # Draw the rounded rectangle
         pygame.draw.rect(
-            self.screen,
+            surface,
             self.banner_color,  # Yellow color
             (banner_rect_x, banner_rect_y, banner_rect_width, banner_rect_height),
             border_radius=20  # Rounded corners
@@ -113,29 +177,50 @@ class PictureGridApp:
 
         # Position the text in the center of the rounded rectangle
         text_rect = banner_surface.get_rect(center=(banner_rect_x + banner_rect_width // 2, banner_rect_y + banner_rect_height // 2))
-        self.screen.blit(banner_surface, text_rect)
-
-    def display_image_grid(self):
-        """Display the grid of images within the square block."""
+        surface.blit(banner_surface, text_rect)
+
+    def tile_rect(self, idx):
+        """Return the screen rect of the grid image at idx."""
+        row = idx // 5
+        col = idx % 5
+        x = self.square_x + col * (self.image_size[0] + self.grid_x_spacing) + self.grid_x_spacing
+        y = self.square_y + row * (self.image_size[1] + self.grid_y_spacing) + self.banner_height + self.grid_y_spacing
+        return pygame.Rect(x, y, self.image_size[0], self.image_size[1])
+
+    def display_image_grid(self, surface):
+        """Draw the grid images and their labels onto surface."""
         for idx, image_file in enumerate(self.file_names):
-            row = idx // 5
-            col = idx % 5
-            x = self.square_x + col * (self.image_size[0] + self.grid_x_spacing) + self.grid_x_spacing
-            y = self.square_y + row * (self.image_size[1] + self.grid_y_spacing) + self.banner_height + self.grid_y_spacing
+            x, y = self.tile_rect(idx).topleft
 
             # Draw the image
             img = self.image_cache[image_file]
-            self.screen.blit(img, (x, y))
-
-            # Draw a yellow border if the image is clicked
-            if image_file in self.clicked_images:
-                border_rect = pygame.Rect(x - 2, y - 2, self.image_size[0] + 4, self.image_size[1] + 4)
-                pygame.draw.rect(self.screen, self.highlight_color, border_rect, width=4)
+            surface.blit(img, (x, y))
 
             # Draw the label
             label_surface = self.font.render(self.labels[idx], True, self.font_color)  # Using self.font for labels
             label_rect = label_surface.get_rect(center=(x + self.image_size[0] // 2, y + self.image_size[1] + 20))
-            self.screen.blit(label_surface, label_rect)
+            surface.blit(label_surface, label_rect)
+
+    def build_grid_layer(self):
+        """Bake everything on the grid screen that never changes into one display-format surface."""
+        self.grid_layer = pygame.Surface(self.screen.get_size()).convert()
+        self.grid_layer.fill((0, 0, 0))
+        if self.background_image:
+            self.grid_layer.blit(self.background_image, (self.square_x, self.square_y))
+        self.display_banner(self.grid_layer)
+        self.display_image_grid(self.grid_layer)
+
+    def highlight_rect(self, idx):
+        """Return the rect covered by the selection border around the image at idx."""
+        return self.tile_rect(idx).inflate(4, 4)
+
+    def draw_grid_screen(self, rect):
+        """Repaint the part of the grid screen inside rect: one blit plus the selection borders."""
+        self.screen.blit(self.grid_layer, rect, rect)
+        for image_file in self.clicked_images:
+            border_rect = self.highlight_rect(self.file_names.index(image_file))
+            if border_rect.colliderect(rect):
+                pygame.draw.rect(self.screen, self.highlight_color, border_rect, width=4)
 
     def on_image_click(self, image_file):
         """Handle image click events."""
@@ -144,105 +229,134 @@ class PictureGridApp:
         else:
             if len(self.clicked_images) < 2:
                 self.clicked_images.add(image_file)  # Select if fewer than 2 images are selected
+        self.renderer.invalidate(self.highlight_rect(self.file_names.index(image_file)))
 
-        if len(self.clicked_images) == 2:
+        if len(self.clicked_images) == 1:
+            self.prefetch_selections(next(iter(self.clicked_images)))
+        elif not self.clicked_images:
+            self.prefetcher.cancel()  # First tile deselected, candidates no longer needed
+        elif len(self.clicked_images) == 2:
             self.show_loading_screen()
 
+    def load_selection(self, path, size):
+        """Decode a combination image, from the archive if there is one. None if the catalog has no path."""
+        if path is None:
+            return None
+        if self.selection_archive is not None:
+            return load_image(io.BytesIO(self.selection_archive.read(os.path.basename(path))), size)
+        return load_image(path, size)
+
+    def prefetch_selections(self, image_file):
+        """Start decoding every combination that includes image_file."""
+        candidates = []
+        for other in self.file_names:
+            if other != image_file:
+                entry = self.catalog.lookup(image_file, other)
+                if entry.path is not None:
+                    candidates.append((entry.pair, entry.path))
+        self.prefetcher.prefetch(candidates, (self.square_size, self.square_size))
+
     def show_loading_screen(self):
-        """Show the loading screen for a specified duration and then display the selection screen."""
-        start_time = pygame.time.get_ticks()
-        # Loop until the specified loading duration has passed
-        while pygame.time.get_ticks() - start_time < self.loading_duration:
-            # If a loading GIF exists, cycle through its frames repeatedly
-            if self.loading_frames:
-                for frame in self.loading_frames:
-                    self.screen.fill((0, 0, 0))  # Clear the screen
-                    self.screen.blit(frame, (self.square_x, self.square_y))
-                    pygame.display.flip()
-                    pygame.time.delay(100)
-                    # Check if the total loading duration has been exceeded
-                    if pygame.time.get_ticks() - start_time >= self.loading_duration:
-                        break
-            else:
-                # If no GIF is provided, simply delay a bit before checking again
-                pygame.time.delay(100)
-        self.show_selection_screen()
+        """Switch to the loading screen and start decoding the chosen combination meanwhile."""
+        entry = self.catalog.lookup(*self.clicked_images)
+        self.pending_selection = self.prefetcher.request(entry.pair, entry.path, (self.square_size, self.square_size))
+        self.pending_selection.add_done_callback(lambda _: self.scheduler.notify("selection_decoded"))
+
+        if self.loading_frames_future is not None:
+            self.loading_frames = self.loading_frames_future.result()  # Normally done long before the first visitor
+            self.loading_frames_future = None
+
+        # The selection appears once both the minimum loading time and the decode are over
+        self.loading_elapsed = False
+        self.screen_state = Screen.LOADING
+        self.current_frame = 0
+        self.scheduler.schedule("loading_frame", 0)
+        self.scheduler.schedule("loading_done", self.loading_duration)
+
+    def draw_loading_frame(self):
+        """Draw the next frame of the loading GIF, if there is one, and schedule the one after."""
+        if self.loading_frames:
+            self.screen.fill((0, 0, 0))  # Clear the screen
+            self.screen.blit(self.loading_frames[self.current_frame], (self.square_x, self.square_y))
+            pygame.display.flip()
+            self.current_frame = (self.current_frame + 1) % len(self.loading_frames)
+            self.scheduler.schedule("loading_frame", 100)
 
     def show_selection_screen(self):
         """Show the selection screen with the combined image."""
+        self.scheduler.cancel()
         self.screen.fill((0, 0, 0))  # Clear the screen
 
-        if len(self.clicked_images) == 2:
-            sorted_clicked_images = sorted(
-                self.clicked_images,
-                key=lambda x: self.priority_list[self.file_names.index(x)]
-            )
-            new_image_name = f"{os.path.splitext(sorted_clicked_images[0])[0]}-{os.path.splitext(sorted_clicked_images[1])[0]}.jpg"
-            new_image_path = os.path.join(self.selections_dir, new_image_name)
-
-            if os.path.exists(new_image_path):
-                new_image = pygame.image.load(new_image_path)
-                new_image = pygame.transform.scale(new_image, (self.square_size, self.square_size))
-                self.screen.blit(new_image, (self.square_x, self.square_y))
-
-                # Draw the back button
-                back_button_rect = pygame.Rect(self.square_x + self.square_size - 210, self.square_y + self.square_size - 60, 200, 50)
-                pygame.draw.rect(self.screen, (255, 255, 0), back_button_rect, border_radius=10)  # Yellow button with rounded corners
-                back_button_text = self.font.render("Back", True, (0, 0, 0))  # Black text
-                back_button_text_rect = back_button_text.get_rect(center=back_button_rect.center)
-                self.screen.blit(back_button_text, back_button_text_rect)
-
-                pygame.display.flip()
-
-                # Wait for back button click
-                waiting = True
-                while waiting:
-                    for event in pygame.event.get():
-                        if event.type == pygame.QUIT:
-                            self.running = False
-                            waiting = False
-                        elif event.type == pygame.MOUSEBUTTONDOWN:
-                            if back_button_rect.collidepoint(event.pos):
-                                waiting = False
-                                self.reset_selection()
+        # Decoded by a worker while the loading screen ran
+        try:
+            new_image = self.pending_selection.result()
+        except (pygame.error, OSError) as e:
+            print(f"Error: {e}")  # The file is there but could not be decoded
+            self.reset_selection()
+            return
+        if new_image is None:
+            print(f"Warning: File {self.catalog.lookup(*self.clicked_images).name} not found in {self.selections_dir}.")
+            self.reset_selection()
+            return
+
+        self.screen.blit(new_image, (self.square_x, self.square_y))
+
+        # Draw the back button
+        pygame.draw.rect(self.screen, (255, 255, 0), self.back_button_rect, border_radius=10)  # Yellow button with rounded corners
+        back_button_text = self.font.render("Back", True, (0, 0, 0))  # Black text
+        back_button_text_rect = back_button_text.get_rect(center=self.back_button_rect.center)
+        self.screen.blit(back_button_text, back_button_text_rect)
+
+        pygame.display.flip()
+        self.screen_state = Screen.SELECTION
 
     def reset_selection(self):
         """Reset the selection and return to the image grid."""
         self.clicked_images = set()
         self.selected_frames = {}
-        self.main_loop()
+        self.pending_selection = None
+        self.prefetcher.cancel()
+        self.scheduler.cancel()
+        self.renderer.invalidate()  # The grid was covered by another screen
+        self.screen_state = Screen.GRID
+
+    def on_click(self, pos):
+        """Dispatch a tap to the current screen."""
+        if self.screen_state is Screen.GRID:
+            for idx, image_file in enumerate(self.file_names):
+                if self.tile_rect(idx).collidepoint(pos):
+                    self.on_image_click(image_file)
+        elif self.screen_state is Screen.SELECTION:
+            if self.back_button_rect.collidepoint(pos):
+                self.reset_selection()
+
+    def step(self):
+        """Run one iteration of the main loop: repaint, sleep until something happens, handle it."""
+        if self.screen_state is Screen.GRID:
+            self.renderer.render()  # Repaint only what changed
+
+        events, due = self.scheduler.wait()
+        for event in events:
+            if event.type == pygame.QUIT:
+                self.running = False
+            elif event.type == pygame.MOUSEBUTTONDOWN:
+                self.on_click(event.pos)
+
+        if self.screen_state is Screen.LOADING:
+            if "loading_done" in due:
+                self.loading_elapsed = True
+            if self.loading_elapsed and self.pending_selection.done():
+                self.show_selection_screen()
+            elif "loading_frame" in due:
+                self.draw_loading_frame()  # Keeps animating past loading_duration if the decode is slow
 
     def main_loop(self):
-        """Main loop to handle events and update the screen."""
+        """Main loop to handle events and update the screen, whichever screen is shown."""
         while self.running:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    self.running = False
-                elif event.type == pygame.MOUSEBUTTONDOWN:
-                    # Handle image clicks
-                    for idx, image_file in enumerate(self.file_names):
-                        row = idx // 5
-                        col = idx % 5
-                        x = self.square_x + col * (self.image_size[0] + self.grid_x_spacing) + self.grid_x_spacing
-                        y = self.square_y + row * (self.image_size[1] + self.grid_y_spacing) + self.banner_height + self.grid_y_spacing
-                        rect = pygame.Rect(x, y, self.image_size[0], self.image_size[1])
-                        if rect.collidepoint(event.pos):
-                            self.on_image_click(image_file)
-
-            # Clear the screen and draw black bars
-            self.screen.fill((0, 0, 0))  # Fill the entire screen with black
-
-            # Draw the background image only within the square block
-            if self.background_image:
-                self.screen.blit(self.background_image, (self.square_x, self.square_y))
-
-            # Draw the banner and grid
-            self.display_banner()
-            self.display_image_grid()
-
-            pygame.display.flip()
-            self.clock.tick(30)
+            self.step()
 
+        print(f"Selection cache: {self.selection_cache.stats()}")
+        self.prefetcher.shutdown()
         pygame.quit()
 
 if __name__ == "__main__":
@@ -253,11 +367,12 @@ if __name__ == "__main__":
     SELECTIONS_DIR = os.path.join(BASE_DIR, "Images", "Selections")
     LOADING_GIF_PATH = os.path.join(BASE_DIR, "Images", "Other", "loading.gif")
     BACKGROUND_PATH = os.path.join(BASE_DIR, "Images", "Other", "background_2.jpg")
-
-    FILE_NAMES = ["fritschi.jpg", "hexe.jpg", "spoerri.jpg", "basler.jpg", "fisch.jpg", "affe.jpg", "sau.jpg", "krieger.jpg", "clown.jpg", "hase.jpg", "einhorn.png", "grinch.jpg", "alien.jpg", "teufel.jpg", "guy.jpg", "ueli.jpg", "steampunk.jpg", "pippi.jpg", "wonderwoman.jpg", "federer.jpg"]
-    LABELS = ["zünftig", "rüüdig", "kult-urig", "appropriated", "laborig", "huereaffig", "sauglatt", "kriegerisch", "creepy", "cute", "magisch", "cringe", "extraterrestrisch", "teuflisch", "random", "schwurblig", "boomerig", "feministisch", "superstark", "bönzlig"]
-    PRIORITY_LIST = [1, 2, 3, 4, 13, 6, 7, 8, 9, 10, 11, 17, 5, 14, 15, 16, 12, 18, 19, 20]  # Example priority list
+    ASSET_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "fasnacht")
+    SELECTION_ARCHIVE_PATH = os.path.join(BASE_DIR, "Images", "selections.archive")  # Built by selection_archive.py
 
     # Here, loading_duration is set to 2000 milliseconds (2 seconds)
+    # and about 40 full-screen combinations are kept decoded, which fits a 1 GB Pi
     app = PictureGridApp(IMAGE_DIR, BANNER_PATH, BACK_BUTTON_PATH, SELECTIONS_DIR, FILE_NAMES, LABELS, PRIORITY_LIST,
-                         scaling_factor=1.37, loading_gif_path=LOADING_GIF_PATH, background_path=BACKGROUND_PATH, loading_duration=2000)
+                         scaling_factor=1.37, loading_gif_path=LOADING_GIF_PATH, background_path=BACKGROUND_PATH, loading_duration=2000,
+                         selection_cache_mb=192, asset_cache_dir=ASSET_CACHE_DIR,
+                         selection_archive_path=SELECTION_ARCHIVE_PATH)
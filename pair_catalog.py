@@ -0,0 +1,73 @@
+import os
+from collections import namedtuple
+
+# The grid, in display order, shared by every frontend and by build_web_index.py
+FILE_NAMES = ["fritschi.jpg", "hexe.jpg", "spoerri.jpg", "basler.jpg", "fisch.jpg", "affe.jpg", "sau.jpg", "krieger.jpg", "clown.jpg", "hase.jpg", "einhorn.png", "grinch.jpg", "alien.jpg", "teufel.jpg", "guy.jpg", "ueli.jpg", "steampunk.jpg", "pippi.jpg", "wonderwoman.jpg", "federer.jpg"]
+LABELS = ["zünftig", "rüüdig", "kult-urig", "appropriated", "laborig", "huereaffig", "sauglatt", "kriegerisch", "creepy", "cute", "magisch", "cringe", "extraterrestrisch", "teuflisch", "random", "schwurblig", "boomerig", "feministisch", "superstark", "bönzlig"]
+PRIORITY_LIST = [1, 2, 3, 4, 13, 6, 7, 8, 9, 10, 11, 17, 5, 14, 15, 16, 12, 18, 19, 20]  # Lower comes first in a combination's name
+
+# pair: the two grid files ordered by priority; name: the combination's file name;
+# path: where it is, or None if it was not found at startup
+PairEntry = namedtuple("PairEntry", ["pair", "name", "path"])
+
+
+def list_selections(selections_dir, selection_archive=None):
+    """Names of the combination images available, from the archive if there is one."""
+    if selection_archive is not None:
+        return list(selection_archive.entries)
+    try:
+        return os.listdir(selections_dir)
+    except OSError as e:
+        print(f"Warning: Could not list {selections_dir}: {e}")
+        return []
+
+
+class PairCatalog:
+    """Table resolving every unordered pair of grid images to its combination image.
+
+    Built once at startup from the grid order and priorities and checked
+    against the available files, so that a lookup never touches the disk.
+    """
+
+    def __init__(self, file_names, priority_list, selections_dir, available_names, extension=".jpg"):
+        self.available = set(available_names)
+        self._index = {image_file: i for i, image_file in enumerate(file_names)}
+        self._table = [[None] * len(file_names) for _ in file_names]
+        self._by_name = {}
+        for i, first in enumerate(file_names):
+            for j, second in enumerate(file_names):
+                if i < j:
+                    pair = (first, second) if priority_list[i] <= priority_list[j] else (second, first)
+                    name = f"{os.path.splitext(pair[0])[0]}-{os.path.splitext(pair[1])[0]}{extension}"
+                    path = os.path.join(selections_dir, name) if name in self.available else None
+                    self._table[i][j] = self._table[j][i] = self._by_name[name] = PairEntry(pair, name, path)
+
+    def lookup(self, first, second):
+        """Return the PairEntry for two different grid files, in either order."""
+        return self._table[self._index[first]][self._index[second]]
+
+    def path_of(self, name):
+        """Path of a combination image by file name, or None if it was not found."""
+        entry = self._by_name.get(name)
+        return entry.path if entry else None
+
+    def entries(self):
+        """Every pair once."""
+        return list(self._by_name.values())
+
+    def missing(self):
+        """Names of combination images that no file was found for."""
+        return sorted(entry.name for entry in self.entries() if entry.path is None)
+
+    def extra(self):
+        """Available files that belong to no pair, e.g. misnamed or duplicate images."""
+        return sorted(self.available - self._by_name.keys())
+
+    def report(self):
+        """Print what is missing or unexpected among the combination images."""
+        missing = self.missing()
+        extra = self.extra()
+        if missing:
+            print(f"Warning: {len(missing)} combination image(s) missing: {', '.join(missing)}")
+        if extra:
+            print(f"Warning: {len(extra)} file(s) match no combination: {', '.join(extra)}")
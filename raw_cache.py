@@ -0,0 +1,58 @@
+import hashlib
+import os
+import struct
+import zlib
+
+CACHE_MAGIC = b"FSNC"
+CACHE_HEADER = struct.Struct("<4sHHHB")  # magic, width, height, frame count, has alpha
+
+
+class RawFrameCache:
+    """On-disk cache of scaled frames as zlib-compressed raw RGB or RGBA pixels.
+
+    Entries are keyed by the source file and its mtime, the target size, the
+    asset class (which picks the resampling filter) and a variant naming
+    everything else that changes the pixels (frontend, scaling factor,
+    screen size). Without a cache_dir nothing is read or written. Safe to
+    use from several threads at once.
+    """
+
+    def __init__(self, cache_dir, variant):
+        self.cache_dir = cache_dir
+        self.variant = variant
+        if self.cache_dir:
+            os.makedirs(self.cache_dir, exist_ok=True)
+
+    def read(self, path, size, asset_class):
+        """Return (frame size, has alpha, [frame bytes]), or None if not cached or unreadable."""
+        if not self.cache_dir:
+            return None
+        try:
+            with open(self._entry_path(path, size, asset_class), "rb") as f:
+                magic, width, height, count, alpha = CACHE_HEADER.unpack(f.read(CACHE_HEADER.size))
+                pixels = zlib.decompress(f.read())
+        except (OSError, struct.error, zlib.error):
+            return None
+        frame_bytes = width * height * (4 if alpha else 3)
+        if magic != CACHE_MAGIC or len(pixels) != count * frame_bytes:
+            return None
+        return (width, height), bool(alpha), [pixels[i * frame_bytes:(i + 1) * frame_bytes] for i in range(count)]
+
+    def write(self, path, size, asset_class, frame_size, alpha, frames):
+        """Store frames (raw RGBA if alpha, else RGB); a failed write only costs the next load."""
+        if not self.cache_dir:
+            return
+        entry_path = self._entry_path(path, size, asset_class)
+        tmp_path = f"{entry_path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(CACHE_HEADER.pack(CACHE_MAGIC, frame_size[0], frame_size[1], len(frames), alpha))
+                f.write(zlib.compress(b"".join(frames), 1))
+            os.replace(tmp_path, entry_path)  # Readers never see a half-written entry
+        except OSError as e:
+            print(f"Warning: Could not write asset cache entry {entry_path}: {e}")
+
+    def _entry_path(self, path, size, asset_class):
+        """Name the entry after everything that changes its pixels."""
+        key = f"{os.path.abspath(path)}|{os.stat(path).st_mtime_ns}|{self.variant}|{asset_class}|{tuple(size)}"
+        return os.path.join(self.cache_dir, hashlib.sha1(key.encode()).hexdigest() + ".raw")
@@ -0,0 +1,9 @@
+from enum import Enum
+
+
+class Screen(Enum):
+    """Screens of the pygame kiosk; the app's single main loop dispatches on these."""
+    GRID = "grid"
+    LOADING = "loading"
+    SELECTION = "selection"
+    FORCED = "forced"  # GPIO lock screen (testing.py)
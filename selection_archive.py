@@ -0,0 +1,103 @@
+import json
+import mmap
+import os
+import struct
+
+ARCHIVE_MAGIC = b"FSNA"
+ARCHIVE_VERSION = 2
+ARCHIVE_HEADER = struct.Struct("<4sHI")  # magic, version, length of the JSON index that follows
+
+
+def file_stamp(path):
+    """Identify one version of an image file; replacing it in place changes this, not the directory."""
+    stat = os.stat(path)
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def build_archive(selections_dir, archive_path):
+    """Pack every combination JPEG in selections_dir, back to back, into one indexed archive."""
+    names = sorted(name for name in os.listdir(selections_dir) if name.lower().endswith(".jpg"))
+    entries = {}
+    stamps = {}
+    offset = 0
+    for name in names:
+        stamps[name] = file_stamp(os.path.join(selections_dir, name))
+        length = stamps[name][1]
+        entries[name] = [offset, length]
+        offset += length
+    index = {"dir_mtime_ns": os.stat(selections_dir).st_mtime_ns, "entries": entries, "stamps": stamps}
+    index_bytes = json.dumps(index).encode()
+
+    tmp_path = f"{archive_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(ARCHIVE_HEADER.pack(ARCHIVE_MAGIC, ARCHIVE_VERSION, len(index_bytes)))
+        f.write(index_bytes)
+        for name in names:
+            with open(os.path.join(selections_dir, name), "rb") as image:
+                f.write(image.read())
+    os.replace(tmp_path, archive_path)
+    return len(names), offset
+
+
+class SelectionArchive:
+    """Memory-mapped archive of combination images, read by name without touching the directory."""
+
+    def __init__(self, archive_path):
+        with open(archive_path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, index_length = ARCHIVE_HEADER.unpack_from(self._mmap)
+        if magic != ARCHIVE_MAGIC or version != ARCHIVE_VERSION:
+            raise ValueError(f"{archive_path} is not a selection archive")
+        index = json.loads(bytes(self._mmap[ARCHIVE_HEADER.size:ARCHIVE_HEADER.size + index_length]))
+        self.dir_mtime_ns = index["dir_mtime_ns"]
+        self.entries = index["entries"]
+        self.stamps = index["stamps"]
+        self._data = memoryview(self._mmap)[ARCHIVE_HEADER.size + index_length:]
+
+    @classmethod
+    def open(cls, archive_path, selections_dir):
+        """Return the archive if it exists and matches selections_dir, else None (use the files)."""
+        if not os.path.exists(archive_path):
+            return None
+        try:
+            archive = cls(archive_path)
+        except (OSError, ValueError, KeyError, struct.error) as e:
+            print(f"Warning: Could not read selection archive {archive_path}: {e}")
+            return None
+        if os.path.isdir(selections_dir) and not archive.matches(selections_dir):
+            print(f"Warning: {selections_dir} changed since {archive_path} was built, reading the files instead. "
+                  f"Rebuild it with: python selection_archive.py")
+            return None
+        return archive
+
+    def matches(self, selections_dir):
+        """Whether selections_dir still holds exactly the images packed; one stat per image, at startup."""
+        if os.stat(selections_dir).st_mtime_ns != self.dir_mtime_ns:
+            return False  # Images added, removed or renamed
+        try:
+            return all(file_stamp(os.path.join(selections_dir, name)) == stamp for name, stamp in self.stamps.items())
+        except OSError:
+            return False
+
+    def __contains__(self, name):
+        return name in self.entries
+
+    def __len__(self):
+        return len(self.entries)
+
+    def read(self, name):
+        """Return a memoryview of the encoded image, or None if the archive has no such image."""
+        entry = self.entries.get(name)
+        if entry is None:
+            return None
+        offset, length = entry
+        return self._data[offset:offset + length]
+
+
+if __name__ == "__main__":
+    BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+    SELECTIONS_DIR = os.path.join(BASE_DIR, "Images", "Selections")
+    ARCHIVE_PATH = os.path.join(BASE_DIR, "Images", "selections.archive")
+
+    count, size = build_archive(SELECTIONS_DIR, ARCHIVE_PATH)
+    print(f"Packed {count} images ({size / (1024 * 1024):.1f} MB) into {ARCHIVE_PATH}")
@@ -0,0 +1,137 @@
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+
+
+def surface_nbytes(surface):
+    """Approximate memory held by a pygame surface's pixel buffer."""
+    return surface.get_pitch() * surface.get_height()
+
+
+class SurfaceCache:
+    """LRU cache of decoded selection surfaces, bounded by a memory budget in MB."""
+
+    def __init__(self, budget_mb=192, size_of=surface_nbytes):
+        self.budget_bytes = int(budget_mb * 1024 * 1024)
+        self.size_of = size_of
+        self.used_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # key -> (surface, nbytes), least recently used first
+        self._lock = threading.Lock()
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def get(self, key):
+        """Return the cached surface for key (marking it recently used), or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, surface):
+        """Store a surface, evicting least recently used entries beyond the budget."""
+        nbytes = self.size_of(surface)
+        if nbytes > self.budget_bytes:
+            return  # Would evict everything else and still not fit
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.used_bytes -= old[1]
+            self._entries[key] = (surface, nbytes)
+            self.used_bytes += nbytes
+            while self.used_bytes > self.budget_bytes:
+                _, (_, evicted_bytes) = self._entries.popitem(last=False)
+                self.used_bytes -= evicted_bytes
+
+    def stats(self):
+        """Return hit/miss counters and memory use, e.g. for logging."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self._entries),
+                "used_mb": self.used_bytes / (1024 * 1024),
+                "budget_mb": self.budget_bytes / (1024 * 1024),
+            }
+
+
+class SelectionPrefetcher:
+    """Decode and scale candidate combination images on worker threads."""
+
+    def __init__(self, cache, load, max_workers=2):
+        self.cache = cache
+        self.load = load  # Callable (path, size) -> surface, or None if there is no such image
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="prefetch")
+        self._pending = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def prefetch(self, candidates, size):
+        """Queue (pair, path) candidates that are not cached yet, replacing any earlier batch."""
+        self.cancel()
+        with self._lock:
+            generation = self._generation
+            for pair, path in candidates:
+                key = (pair, size)
+                if key in self._pending or key in self.cache:
+                    continue
+                self._pending[key] = self._executor.submit(self._load, key, path, generation)
+
+    def _load(self, key, path, generation):
+        """Worker: decode one image unless its batch was cancelled meanwhile. None if missing."""
+        surface = None
+        if generation == self._generation:
+            surface = self.load(path, key[1])
+        with self._lock:
+            if generation == self._generation:
+                if surface is not None:
+                    self.cache.put(key, surface)
+                self._pending.pop(key, None)
+        return surface
+
+    def cancel(self):
+        """Drop all queued work; loads already running finish but are not cached."""
+        with self._lock:
+            self._generation += 1
+            for future in self._pending.values():
+                future.cancel()
+            self._pending.clear()
+
+    def request(self, pair, path, size):
+        """Return a future for the surface of pair, dropping every other queued candidate.
+
+        Used once the visitor has chosen, so that this decode is next in line.
+        The future resolves to None if the image does not exist.
+        """
+        key = (pair, size)
+        with self._lock:
+            for other_key, future in list(self._pending.items()):
+                if other_key != key and future.cancel():
+                    del self._pending[other_key]
+
+            future = self._pending.get(key)
+            if future is None:
+                surface = self.cache.get(key)
+                if surface is not None:
+                    future = Future()
+                    future.set_result(surface)
+                else:
+                    future = self._executor.submit(self._load, key, path, self._generation)
+                    self._pending[key] = future
+        return future
+
+    def shutdown(self):
+        """Stop the worker threads without waiting for queued loads."""
+        self.cancel()
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -1,10 +1,17 @@
+import io
 import os
+from concurrent.futures import ThreadPoolExecutor
 from tkinter import Tk, Frame, Label, Canvas, Button  # Import Button from tkinter
 from tkinter.font import Font
-from PIL import Image, ImageTk, ImageSequence
+from PIL import ImageTk
+from selection_archive import SelectionArchive
+from pair_catalog import FILE_NAMES, LABELS, PRIORITY_LIST, PairCatalog, list_selections
+from tk_animation import AnimationController
+from tk_assets import load_photos, tk_asset_cache
+from image_decode import decode_scaled
 
 class PictureGridApp:
-    def __init__(self, root, image_dir, banner_path, back_button_path, selections_dir, file_names, labels, priority_list, scaling_factor=1.0, loading_gif_path=None, background_path=None):
+    def __init__(self, root, image_dir, banner_path, back_button_path, selections_dir, file_names, labels, priority_list, scaling_factor=1.0, loading_gif_path=None, background_path=None, selection_archive_path=None, asset_cache_dir=None, grid_renderer="widgets"):
         self.root = root
         self.image_dir = image_dir
         self.banner_path = banner_path
@@ -16,6 +23,7 @@ class PictureGridApp:
         self.scaling_factor = scaling_factor
         self.loading_gif_path = loading_gif_path
         self.background_path = background_path
+        self.grid_renderer = grid_renderer  # "widgets": a Frame and Labels per tile; "canvas": one Canvas
 
         # Set the grid background color to blue
         self.grid_bg_color = "#4387ba"  # Blue color
@@ -23,6 +31,14 @@ class PictureGridApp:
         # Validate input lengths
         if len(self.file_names) != len(self.labels) or len(self.file_names) != len(self.priority_list):
             raise ValueError("The length of file_names, labels, and priority_list must be the same.")
+        if self.grid_renderer not in ("widgets", "canvas"):
+            raise ValueError(f"grid_renderer must be 'widgets' or 'canvas', not {self.grid_renderer!r}.")
+
+        # Combination images come from one mapped archive when it is built and current
+        self.selection_archive = SelectionArchive.open(selection_archive_path, selections_dir) if selection_archive_path else None
+        # Every pair is resolved once; a missing combination is reported now rather than when picked
+        self.catalog = PairCatalog(file_names, priority_list, selections_dir, list_selections(selections_dir, self.selection_archive))
+        self.catalog.report()
 
         self.root.attributes("-fullscreen", True)
         self.root.protocol("WM_DELETE_WINDOW", self.do_nothing)
@@ -34,15 +50,15 @@ class PictureGridApp:
         self.square_x = 0
         self.square_y = (self.screen_height - self.square_size) // 10
 
+        # Resized thumbnails, background and GIF frames survive restarts here; None to always resample
+        self.asset_cache = tk_asset_cache(asset_cache_dir, (self.screen_width, self.screen_height))
+
         self.background_canvas = Canvas(self.root, width=self.screen_width, height=self.screen_height, bg="black", highlightthickness=0)
         self.background_canvas.pack(fill="both", expand=True)
 
         self.square_frame = Frame(self.root, width=self.square_size, height=self.square_size, bg="black", highlightthickness=0)
         self.square_frame.place(x=self.square_x, y=self.square_y)
 
-        # Set up the background
-        self.setup_background()
-
         self.grid_y_spacing = int(9 * self.scaling_factor)
         self.grid_x_spacing = int(13 * self.scaling_factor)
         self.image_size = (int(150 * self.scaling_factor), int(150 * self.scaling_factor))
@@ -64,23 +80,103 @@ class PictureGridApp:
         self.selected_frames = {}
         self.image_cache = {}
 
+        # Combination images are decoded and resized off the Tk thread
+        self.decoder = ThreadPoolExecutor(max_workers=2, thread_name_prefix="decode")
+        self.pending_selection = None  # Future of the resized combination being decoded
+
         self.root.title("Kombiniere zwei Masken")
         self.selection_frame = None
 
-        # Pre-render images and set up loading screen
+        # Pre-render images, then build every screen once; they are only swapped in and out
         self.pre_render_images()
+        self.current_screen = None
+        self.animations = AnimationController(self.root)  # Every after() timer of the screens
+        self.tile_labels = {}  # image_file -> image Label, for the highlight border (widgets)
+        self.tile_items = {}  # Canvas item of a tile image or label -> image_file, for hit-testing (canvas)
+        self.highlight_items = {}  # image_file -> hidden border rectangle item (canvas)
+        self.build_grid_screen()
         self.setup_loading_screen()
-
+        self.build_selection_screen()
+        self.show_screen(self.grid_screen)
+
+    def build_grid_screen(self):
+        """Build the grid screen: background, banner and the image grid."""
+        if self.grid_renderer == "canvas":
+            self.build_grid_canvas()
+            return
+        self.grid_screen = Frame(self.square_frame, bg="black", highlightthickness=0)
+        self.setup_background()
         self.display_banner()
         self.display_image_grid()
 
+    def build_grid_canvas(self):
+        """Build the grid screen as one Canvas, with an item per image, label and highlight border."""
+        canvas = Canvas(self.square_frame, width=self.square_size, height=self.square_size, bg="black", highlightthickness=0)
+        self.grid_screen = canvas
+        if self.background_path and os.path.exists(self.background_path):
+            self.background_photo = load_photos(self.background_path, (self.square_size, self.square_size), "background", self.asset_cache)[0]
+            canvas.create_image(0, 0, image=self.background_photo, anchor="nw")
+
+        # Banner, laid out like the widget version
+        banner_font = Font(family="Helvetica", size=24)
+        banner_top = self.title_top_spacing
+        banner_bottom = banner_top + banner_font.metrics("linespace") + 4
+        canvas.create_rectangle(self.grid_x_spacing, banner_top, self.square_size - self.grid_x_spacing, banner_bottom, fill="yellow", outline="")
+        canvas.create_text(self.square_size // 2, (banner_top + banner_bottom) // 2, text="Randomisiere zwei Mottos - Randomize two Themes", font=banner_font, fill="black")
+
+        # Image grid on its blue area, 5 tiles per row, centred
+        grid_top = banner_bottom + self.title_grid_spacing
+        canvas.create_rectangle(0, grid_top, self.square_size, self.square_size, fill=self.grid_bg_color, outline="")
+        cell_width = self.image_size[0] + 2 * self.grid_x_spacing
+        cell_height = self.image_size[1] + 40 + 2 * self.grid_y_spacing
+        grid_left = (self.square_size - 5 * cell_width) // 2
+        for idx, image_file in enumerate(self.file_names):
+            x = grid_left + (idx % 5) * cell_width + self.grid_x_spacing
+            y = grid_top + (idx // 5) * cell_height + self.grid_y_spacing
+            image_item = canvas.create_image(x, y, image=self.image_cache[image_file], anchor="nw")
+            text_item = canvas.create_text(x + self.image_size[0] // 2, y + self.image_size[1] + 5, text=self.labels[idx], font=("Helvetica", self.font_size), fill="white", anchor="n")
+            self.highlight_items[image_file] = canvas.create_rectangle(x - 2, y - 2, x + self.image_size[0] + 2, y + self.image_size[1] + 2, outline="yellow", width=4, state="hidden")
+            self.tile_items[image_item] = self.tile_items[text_item] = image_file
+
+        canvas.bind("<Button-1>", self.on_canvas_click)
+
+    def build_selection_screen(self):
+        """Build the selection screen; show_selection_screen only swaps its image."""
+        self.selection_screen = Frame(self.square_frame, bg="black", highlightthickness=0)
+        self.selection_label = Label(self.selection_screen, bg="black", highlightthickness=0)
+        self.selection_label.pack(fill="both", expand=True)
+
+        # Add the back button
+        back_button = Button(
+            self.selection_screen,
+            text="← Back",
+            bg="yellow",  # Set background color to yellow
+            fg="black",  # Set text color to black
+            font=("Helvetica", 16),  # Increase font size
+            relief="flat",  # Remove button border
+            command=self.reset_selection
+        )
+        back_button.place(
+            relx=1.0,  # Position at the right edge
+            rely=1.0,  # Position at the bottom edge
+            anchor="se",  # Anchor to the bottom-right corner
+            width=200,  # Set width
+            height=50,  # Set height
+        )
+
+    def show_screen(self, screen):
+        """Hide the current screen and show screen (grid_screen, loading_label or selection_screen)."""
+        self.animations.cancel()  # Timers belong to the screen being hidden
+        if self.current_screen is not None:
+            self.current_screen.pack_forget()
+        screen.pack(fill="both", expand=True)
+        self.current_screen = screen
+
     def setup_background(self):
         """Set up the background image."""
         if self.background_path and os.path.exists(self.background_path):
-            self.background_image = Image.open(self.background_path)
-            self.background_image = self.background_image.resize((self.square_size, self.square_size), Image.Resampling.LANCZOS)
-            self.background_photo = ImageTk.PhotoImage(self.background_image)
-            self.background_label = Label(self.square_frame, image=self.background_photo, bg="black")
+            self.background_photo = load_photos(self.background_path, (self.square_size, self.square_size), "background", self.asset_cache)[0]
+            self.background_label = Label(self.grid_screen, image=self.background_photo, bg="black")
             self.background_label.place(x=0, y=0, relwidth=1, relheight=1)
         else:
             self.background_label = None
@@ -91,9 +187,7 @@ class PictureGridApp:
         for image_file in self.file_names:
             image_path = os.path.join(self.image_dir, image_file)
             if os.path.exists(image_path):
-                img = Image.open(image_path)
-                img = img.resize(self.image_size, Image.Resampling.LANCZOS)
-                self.image_cache[image_file] = ImageTk.PhotoImage(img)
+                self.image_cache[image_file] = load_photos(image_path, self.image_size, "thumbnail", self.asset_cache)[0]
             else:
                 print(f"Warning: File {image_file} not found in {self.image_dir}. Skipping.")
 
@@ -103,19 +197,12 @@ class PictureGridApp:
             print(f"Warning: Loading GIF not found at {self.loading_gif_path}.")
             self.loading_label = Label(self.square_frame, text="Loading...", font=("Helvetica", 24), fg="white", bg="black")
         else:
-            self.loading_gif = Image.open(self.loading_gif_path)
-            self.loading_frames = [
-                ImageTk.PhotoImage(frame.resize((self.square_size, self.square_size), Image.Resampling.LANCZOS))
-                for frame in ImageSequence.Iterator(self.loading_gif)
-            ]
+            self.loading_frames = load_photos(self.loading_gif_path, (self.square_size, self.square_size), "animation", self.asset_cache)
             self.loading_label = Label(self.square_frame, bg="black", highlightthickness=0)
-            self.current_frame = 0
-
-        self.loading_label.pack_forget()  # Hide initially
 
     def display_banner(self):
         """Display the banner at the top of the screen."""
-        banner_frame = Frame(self.square_frame, height=self.banner_height, bg="lightgray")
+        banner_frame = Frame(self.grid_screen, height=self.banner_height, bg="lightgray")
         banner_frame.pack(fill="x", padx=self.grid_x_spacing, pady=(self.title_top_spacing, self.title_grid_spacing))
 
         banner_label = Label(banner_frame, text="Randomisiere zwei Mottos - Randomize two Themes", font=("Helvetica", 24), fg="black", bg="yellow")
@@ -123,7 +210,7 @@ class PictureGridApp:
 
     def display_image_grid(self):
         """Display the grid of images."""
-        images_frame = Frame(self.square_frame, bg=self.grid_bg_color, highlightthickness=0)
+        images_frame = Frame(self.grid_screen, bg=self.grid_bg_color, highlightthickness=0)
         images_frame.pack(fill="both", expand=True)  # Removed padx and pady
 
         for idx, image_file in enumerate(self.file_names):
@@ -141,114 +228,105 @@ class PictureGridApp:
             text_label = Label(container_frame, text=self.labels[idx], font=("Helvetica", self.font_size), fg="white", bg=self.grid_bg_color)
             text_label.pack(pady=(5, 10))  # Add padding at the top and bottom of the text label
 
-            img_label.bind("<Button-1>", lambda e, file=image_file, label=img_label: self.on_image_click(file, label))
+            img_label.bind("<Button-1>", lambda e, file=image_file: self.on_image_click(file))
+            self.tile_labels[image_file] = img_label
 
-    def on_image_click(self, image_file, img_label):
+    def on_canvas_click(self, event):
+        """Hit-test a tap on the canvas grid against the tile images and labels."""
+        for item in reversed(self.grid_screen.find_overlapping(event.x, event.y, event.x, event.y)):
+            if item in self.tile_items:
+                self.on_image_click(self.tile_items[item])
+                return
+
+    def set_highlight(self, image_file, on):
+        """Show or hide the yellow border around a tile."""
+        if self.grid_renderer == "canvas":
+            # A single item change, no layout pass
+            self.grid_screen.itemconfigure(self.highlight_items[image_file], state="normal" if on else "hidden")
+        elif on:
+            self.tile_labels[image_file].config(
+                highlightthickness=4,  # Add a border
+                highlightbackground="yellow"  # Set the border color to yellow
+            )
+        else:
+            self.tile_labels[image_file].config(highlightthickness=0)  # Remove the border
+
+    def on_image_click(self, image_file):
         """Handle image click events."""
         if image_file in self.clicked_images:
             # If the image is already selected, deselect it
             self.clicked_images.remove(image_file)
-            img_label.config(highlightthickness=0)  # Remove the border
+            self.set_highlight(image_file, False)
         else:
             if len(self.clicked_images) < 2:
                 # If the image is not selected and fewer than 2 images are selected, select it
                 self.clicked_images.append(image_file)
-                img_label.config(
-                    highlightthickness=4,  # Add a border
-                    highlightbackground="yellow"  # Set the border color to yellow
-                )
+                self.set_highlight(image_file, True)
 
         # If two images are selected, show the loading screen
         if len(self.clicked_images) == 2:
             self.show_loading_screen()
 
     def show_loading_screen(self):
-        """Show the loading screen."""
-        self.clear_window()
-        self.loading_label.pack(fill="both", expand=True)
+        """Show the loading screen and start decoding the chosen combination meanwhile."""
+        entry = self.catalog.lookup(*self.clicked_images)
+        self.pending_selection = self.decoder.submit(self.decode_selection, entry) if entry.path else None
+
+        self.show_screen(self.loading_label)
         if hasattr(self, "loading_frames"):
-            self.play_gif()
-        self.root.after(self.loading_time, self.stop_gif_and_show_selection_screen)
+            self.animations.animate(self.loading_label, self.loading_frames)
+        self.animations.schedule("loading_done", self.loading_time, self.stop_gif_and_show_selection_screen)
 
-    def play_gif(self):
-        """Play the loading GIF animation."""
-        if hasattr(self, "loading_label") and self.loading_label.winfo_exists():
-            self.loading_label.config(image=self.loading_frames[self.current_frame])
-            self.current_frame = (self.current_frame + 1) % len(self.loading_frames)
-            self.root.after(100, self.play_gif)
+    def decode_selection(self, entry):
+        """Worker thread: decode and resize a combination image. No Tk calls here."""
+        if self.selection_archive is not None:
+            new_image_source = io.BytesIO(self.selection_archive.read(entry.name))
+        else:
+            new_image_source = entry.path
+        return decode_scaled(new_image_source, (self.square_size, self.square_size), "selection")
 
     def stop_gif_and_show_selection_screen(self):
-        """Stop the GIF and show the selection screen."""
-        if hasattr(self, "loading_label"):
-            self.loading_label.pack_forget()  # Hide the loading label
+        """Stop the GIF and show the selection screen, once the decode is done too."""
+        if self.pending_selection is not None and not self.pending_selection.done():
+            # Keep animating and look again shortly; the worker never touches Tk itself
+            self.animations.schedule("loading_done", 20, self.stop_gif_and_show_selection_screen)
+            return
+        self.animations.cancel("animation")
         self.show_selection_screen()
 
     def show_selection_screen(self):
         """Show the selection screen with the combined image."""
-        self.clear_window()
-
-        # Sort clicked_images based on priority_list
         if len(self.clicked_images) == 2:
-            try:
-                # Sort based on priority_list
-                sorted_clicked_images = sorted(
-                    self.clicked_images,
-                    key=lambda x: self.priority_list[self.file_names.index(x)]
-                )
-            except ValueError as e:
-                print(f"Error: {e}. Ensure all clicked images are in file_names.")
+            entry = self.catalog.lookup(*self.clicked_images)
+            if self.pending_selection is None:
+                print(f"Warning: File {entry.name} not found in {self.selections_dir}.")
+                self.reset_selection()
                 return
 
-            # Create the combined file name
-            new_image_name = f"{os.path.splitext(sorted_clicked_images[0])[0]}-{os.path.splitext(sorted_clicked_images[1])[0]}.jpg"
-            new_image_path = os.path.join(self.selections_dir, new_image_name)
-
-            if not os.path.exists(new_image_path):
-                print(f"Warning: File {new_image_name} not found in {self.selections_dir}.")
+            try:
+                new_image = self.pending_selection.result()
+            except OSError as e:  # Also covers PIL's UnidentifiedImageError
+                print(f"Warning: Could not load {entry.name}: {e}")
+                self.reset_selection()
                 return
 
-            # Load and display the combined image
-            new_image = Image.open(new_image_path)
-            new_image = new_image.resize((self.square_size, self.square_size), Image.Resampling.LANCZOS)
+            # Only the PhotoImage is created on the Tk thread
             new_photo = ImageTk.PhotoImage(new_image)
-
-            background_label = Label(self.square_frame, image=new_photo, bg="black", highlightthickness=0)
-            background_label.image = new_photo
-            background_label.pack(fill="both", expand=True)
-
-            # Add the back button
-            back_button = Button(
-                self.square_frame,
-                text="← Back",
-                bg="yellow",  # Set background color to yellow
-                fg="black",  # Set text color to black
-                font=("Helvetica", 16),  # Increase font size
-                relief="flat",  # Remove button border
-                command=self.reset_selection
-            )
-            back_button.place(
-                relx=1.0,  # Position at the right edge
-                rely=1.0,  # Position at the bottom edge
-                anchor="se",  # Anchor to the bottom-right corner
-                width=200,  # Set width
-                height=50,  # Set height
-            )
+            self.selection_label.config(image=new_photo)
+            self.selection_label.image = new_photo  # Replaces, and so frees, the previous combination
+            self.pending_selection = None
+            self.show_screen(self.selection_screen)
 
     def reset_selection(self):
         """Reset the selection and return to the image grid."""
+        for image_file in self.clicked_images:
+            self.set_highlight(image_file, False)
         self.clicked_images = []
         self.selected_frames = {}
-        self.clear_window()
-        self.setup_background()  # Recreate the background
-        self.display_banner()
-        self.display_image_grid()
-        self.setup_loading_screen()  # Reinitialize the loading screen
-
-    def clear_window(self):
-        """Clear all widgets from the square frame except the background and loading labels."""
-        for widget in self.square_frame.winfo_children():
-            if widget not in [self.background_label, self.loading_label]:
-                widget.destroy()
+        if self.pending_selection is not None:
+            self.pending_selection.cancel()  # A decode already running just finishes unused
+            self.pending_selection = None
+        self.show_screen(self.grid_screen)
 
     def do_nothing(self):
         """Override the close button to do nothing."""
@@ -263,11 +341,10 @@ if __name__ == "__main__":
     SELECTIONS_DIR = os.path.join(BASE_DIR, "Images", "Selections")
     LOADING_GIF_PATH = os.path.join(BASE_DIR, "Images", "Other", "loading.gif")
     BACKGROUND_PATH = os.path.join(BASE_DIR, "Images", "Other", "background_2.jpg")
-
-    FILE_NAMES = ["fritschi.jpg", "hexe.jpg", "spoerri.jpg", "basler.jpg", "fisch.jpg", "affe.jpg", "sau.jpg", "krieger.jpg", "clown.jpg", "hase.jpg", "einhorn.png", "grinch.jpg", "alien.jpg", "teufel.jpg", "guy.jpg", "ueli.jpg", "steampunk.jpg", "pippi.jpg", "wonderwoman.jpg", "federer.jpg"]
-    LABELS = ["zünftig", "rüüdig", "kult-urig", "appropriated", "laborig", "huereaffig", "sauglatt", "kriegerisch", "creepy", "cute", "magisch", "cringe", "extraterrestrisch", "teuflisch", "random", "schwurblig", "boomerig", "feministisch", "superstark", "bönzlig"]
-    PRIORITY_LIST = [1, 2, 3, 4, 13, 6, 7, 8, 9, 10, 11, 17, 5, 14, 15, 16, 12, 18, 19, 20]  # Example priority list
+    SELECTION_ARCHIVE_PATH = os.path.join(BASE_DIR, "Images", "selections.archive")  # Built by selection_archive.py
+    ASSET_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "fasnacht")
 
     root = Tk()
-    app = PictureGridApp(root, IMAGE_DIR, BANNER_PATH, BACK_BUTTON_PATH, SELECTIONS_DIR, FILE_NAMES, LABELS, PRIORITY_LIST, scaling_factor=1.37, loading_gif_path=LOADING_GIF_PATH, background_path=BACKGROUND_PATH)
+    app = PictureGridApp(root, IMAGE_DIR, BANNER_PATH, BACK_BUTTON_PATH, SELECTIONS_DIR, FILE_NAMES, LABELS, PRIORITY_LIST, scaling_factor=1.37, loading_gif_path=LOADING_GIF_PATH, background_path=BACKGROUND_PATH, selection_archive_path=SELECTION_ARCHIVE_PATH, asset_cache_dir=ASSET_CACHE_DIR,
+                         grid_renderer="widgets")  # or "canvas": the whole grid as one Canvas
     root.mainloop()
\ No newline at end of file
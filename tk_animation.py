@@ -0,0 +1,40 @@
+class AnimationController:
+    """Own the root.after timers of the tkinter screens, so none outlives the screen it belongs to.
+
+    Timers are named; re-arming a name replaces its pending timer, and at
+    most one animation runs at a time.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self._timers = {}  # name -> after id of the pending call
+
+    @property
+    def live_timers(self):
+        """Number of pending after calls, at most one per name."""
+        return len(self._timers)
+
+    def schedule(self, name, delay_ms, callback):
+        """(Re)arm a named one-shot timer."""
+        self.cancel(name)
+        self._timers[name] = self.root.after(delay_ms, self._fire, name, callback)
+
+    def _fire(self, name, callback):
+        self._timers.pop(name, None)
+        callback()
+
+    def cancel(self, name=None):
+        """Disarm one named timer, or all of them (e.g. when the screen is hidden)."""
+        names = list(self._timers) if name is None else [name]
+        for timer_name in names:
+            after_id = self._timers.pop(timer_name, None)
+            if after_id is not None:
+                self.root.after_cancel(after_id)
+
+    def animate(self, label, frames, interval_ms=100):
+        """Cycle label through frames until cancelled, replacing any running animation."""
+        def show(index):
+            label.config(image=frames[index])
+            self.schedule("animation", interval_ms, lambda: show((index + 1) % len(frames)))
+
+        show(0)
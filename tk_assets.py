@@ -0,0 +1,48 @@
+import os
+
+from PIL import Image, ImageSequence, ImageTk
+
+from image_decode import decode_scaled
+from raw_cache import RawFrameCache
+
+_photos = {}  # (path, size, asset class) -> PhotoImages of every frame; the process has one Tk root
+
+
+def resized_frames(path, size, asset_class, disk_cache=None):
+    """Every frame of an image file resized to size, read from disk_cache when it has them.
+
+    Still images go through decode_scaled; the loading GIF ("animation") is
+    resized frame by frame.
+    """
+    cached = disk_cache.read(path, size, asset_class) if disk_cache else None
+    if cached is not None:
+        frame_size, alpha, pixels = cached
+        return [Image.frombytes("RGBA" if alpha else "RGB", frame_size, data) for data in pixels]
+
+    if asset_class == "animation":
+        with Image.open(path) as image:
+            # Pillow resizes palette frames with NEAREST whatever filter is asked for
+            frames = [frame.resize(size, Image.Resampling.LANCZOS) for frame in ImageSequence.Iterator(image)]
+        alpha = frames[0].mode in ("RGBA", "LA") or "transparency" in frames[0].info
+        frames = [frame.convert("RGBA" if alpha else "RGB") for frame in frames]
+    else:
+        frames = [decode_scaled(path, size, asset_class)]
+        alpha = frames[0].mode == "RGBA"
+    if disk_cache:
+        disk_cache.write(path, size, asset_class, frames[0].size, alpha, [frame.tobytes() for frame in frames])
+    return frames
+
+
+def load_photos(path, size, asset_class, disk_cache=None):
+    """PhotoImages of every frame of path resized to size, resampled once per process."""
+    key = (os.path.abspath(path), tuple(size), asset_class)
+    photos = _photos.get(key)
+    if photos is None:
+        photos = [ImageTk.PhotoImage(frame) for frame in resized_frames(path, size, asset_class, disk_cache)]
+        _photos[key] = photos
+    return photos
+
+
+def tk_asset_cache(cache_dir, screen_size):
+    """Disk cache for the tkinter frontend's resized assets; None if cache_dir is None."""
+    return RawFrameCache(cache_dir, f"tk|{tuple(screen_size)}") if cache_dir else None
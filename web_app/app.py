@@ -1,22 +1,104 @@
-from flask import Flask, render_template
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+from collections import namedtuple
+
+from flask import Flask, Response, abort, render_template, request, send_from_directory, url_for
 
 app = Flask(__name__)
 
+CONFIG = {
+    "file_names": ["fritschi.jpg", "hexe.jpg", "spoerri.jpg", "basler.jpg", "fisch.jpg",
+                  "affe.jpg", "sau.jpg", "krieger.jpg", "clown.jpg", "hase.jpg",
+                  "einhorn.png", "grinch.jpg", "alien.jpg", "teufel.jpg", "guy.jpg",
+                  "ueli.jpg", "steampunk.jpg", "pippi.jpg", "wonderwoman.jpg", "federer.jpg"],
+    "labels": ["zünftig", "rüüdig", "kult-urig", "appropriated", "laborig",
+             "huereaffig", "sauglatt", "kriegerisch", "creepy", "cute",
+             "magisch", "cringe", "extraterrestrisch", "teuflisch", "random",
+             "schwurblig", "boomerig", "feministisch", "superstark", "bönzlig"],
+    "priority_list": [1, 2, 3, 4, 13, 6, 7, 8, 9, 10, 11, 17, 5, 14, 15, 16, 12, 18, 19, 20],
+    "scaling_factor": 0.75
+}
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"  # Cache, but check the ETag before every use
+COMPRESSIBLE_TYPES = (".css", ".js", ".svg", ".html")  # Images are already compressed
+
+# version: content hash, also the ETag; gzip_body: precompressed copy of text files
+StaticAsset = namedtuple("StaticAsset", ["version", "gzip_body"])
+
+
+def fingerprint_static(static_folder):
+    """Hash every static file once at startup and gzip the text ones."""
+    assets = {}
+    for directory, _, names in os.walk(static_folder):
+        for name in names:
+            path = os.path.join(directory, name)
+            with open(path, "rb") as f:
+                data = f.read()
+            filename = os.path.relpath(path, static_folder).replace(os.sep, "/")
+            gzip_body = gzip.compress(data, 9, mtime=0) if name.endswith(COMPRESSIBLE_TYPES) else None
+            assets[filename] = StaticAsset(hashlib.sha1(data).hexdigest()[:16], gzip_body)
+    return assets
+
+
+STATIC_ASSETS = fingerprint_static(app.static_folder)
+# The page changes only with the catalog or the static files it links to
+STATIC_VERSIONS = sorted((filename, asset.version) for filename, asset in STATIC_ASSETS.items())
+PAGE_VERSION = hashlib.sha1(json.dumps([CONFIG, STATIC_VERSIONS]).encode()).hexdigest()[:16]
+_pages = {}  # page version -> (html bytes, gzipped html bytes)
+
+
+@app.url_defaults
+def fingerprint_static_urls(endpoint, values):
+    """Make url_for('static', ...) carry the file's content hash, so it can be cached for good."""
+    if endpoint == "static" and values.get("filename") in STATIC_ASSETS:
+        values["v"] = STATIC_ASSETS[values["filename"]].version
+
+
+def send_static(filename):
+    """Static files with strong ETags, gzip where accepted and immutable caching for fingerprinted URLs."""
+    asset = STATIC_ASSETS.get(filename)
+    if asset is None:
+        abort(404)
+    if asset.gzip_body is not None and "gzip" in request.accept_encodings:
+        response = Response(asset.gzip_body, mimetype=mimetypes.guess_type(filename)[0])
+        response.headers["Content-Encoding"] = "gzip"
+        response.set_etag(f"{asset.version}-gz")  # Strong: one per representation
+    else:
+        response = send_from_directory(app.static_folder, filename, etag=False)
+        response.set_etag(asset.version)
+    if asset.gzip_body is not None:
+        response.vary.add("Accept-Encoding")
+    response.headers["Cache-Control"] = IMMUTABLE if request.args.get("v") == asset.version else REVALIDATE
+    return response.make_conditional(request)
+
+
+app.view_functions["static"] = send_static
+
+
 @app.route('/')
 def index():
-    config = {
-        "file_names": ["fritschi.jpg", "hexe.jpg", "spoerri.jpg", "basler.jpg", "fisch.jpg", 
-                      "affe.jpg", "sau.jpg", "krieger.jpg", "clown.jpg", "hase.jpg", 
-                      "einhorn.png", "grinch.jpg", "alien.jpg", "teufel.jpg", "guy.jpg", 
-                      "ueli.jpg", "steampunk.jpg", "pippi.jpg", "wonderwoman.jpg", "federer.jpg"],
-        "labels": ["zünftig", "rüüdig", "kult-urig", "appropriated", "laborig", 
-                 "huereaffig", "sauglatt", "kriegerisch", "creepy", "cute", 
-                 "magisch", "cringe", "extraterrestrisch", "teuflisch", "random", 
-                 "schwurblig", "boomerig", "feministisch", "superstark", "bönzlig"],
-        "priority_list": [1, 2, 3, 4, 13, 6, 7, 8, 9, 10, 11, 17, 5, 14, 15, 16, 12, 18, 19, 20],
-        "scaling_factor": 0.75
-    }
-    return render_template('index.html', **config)
+    if PAGE_VERSION not in _pages:
+        # Rendered once per catalog version instead of on every request
+        selections = sorted(name for name in STATIC_ASSETS if name.startswith("images/selections/"))
+        selection_urls = {name.rsplit("/", 1)[1]: url_for('static', filename=name) for name in selections}
+        html = render_template('index.html', selection_urls=selection_urls, **CONFIG).encode("utf-8")
+        _pages[PAGE_VERSION] = (html, gzip.compress(html, 9, mtime=0))
+    html, gzip_html = _pages[PAGE_VERSION]
+
+    if "gzip" in request.accept_encodings:
+        response = Response(gzip_html, mimetype="text/html")
+        response.headers["Content-Encoding"] = "gzip"
+        response.set_etag(f"{PAGE_VERSION}-gz")
+    else:
+        response = Response(html, mimetype="text/html")
+        response.set_etag(PAGE_VERSION)
+    response.vary.add("Accept-Encoding")
+    response.headers["Cache-Control"] = REVALIDATE
+    return response.make_conditional(request)
 
 if __name__ == '__main__':
-    app.run(debug=True)
\ No newline at end of file
+    app.run(debug=True)
@@ -43,7 +43,8 @@ document.addEventListener('DOMContentLoaded', () => {
         });
 
         const combinedName = `${sortedFilenames[0].split('.')[0]}-${sortedFilenames[1].split('.')[0]}.jpg`;
-        combinedImage.src = `/static/Images/Selections/${combinedName}`;
+        // Fingerprinted URL from the page, so the browser can keep the image cached
+        combinedImage.src = SELECTION_URLS[combinedName] || `/static/images/selections/${combinedName}`;
         
         selectionScreen.style.display = 'block';
     }